@@ -1,17 +1,60 @@
 from mcp.server.fastmcp import FastMCP
 
 from services import workitems
+from settings import settings
 from utils.formatters import (
+    format_planning_day,
+    format_scheduler_metrics,
     format_workitem,
+    format_workitem_comment,
+    format_workitem_transition_path,
+    format_workitem_tree,
     format_workitem_type,
     format_workitem_type_state,
     format_workitem_type_transition,
+    format_workitem_update,
 )
+from utils.logger import with_request_id
+from utils.result_store import result_store
+from utils.scheduler import scheduler
 
 mcp = FastMCP()
 
 
+def build_paged_result(title: str, entries: list[str], separator: str = "\n\n") -> str:
+    """
+    Join the entries of a result, or store them and return a summary with the resources to read them when too large
+
+    Args:
+        title: The title of the result (e.g. "Workitems details")
+        entries: The formatted entries of the result (e.g. one per workitem)
+        separator: The text between the entries (e.g. "\n" for one line entries)
+
+    Returns:
+        The whole result or a summary with the first lines of the first entries and the pages resources
+    """
+    result = separator.join(entries)
+    if len(result) <= settings.RESULT_MAX_CHARS:
+        return result
+
+    handle = result_store.put(title, entries, separator)
+    pages_count = result_store.get_pages_count(handle)
+    summary = "\n".join(
+        " | ".join(entry.split("\n")[:2])[: settings.RESULT_SUMMARY_LINE_MAX_CHARS]
+        for entry in entries[: settings.RESULT_SUMMARY_MAX_ENTRIES]
+    )
+    if len(entries) > settings.RESULT_SUMMARY_MAX_ENTRIES:
+        summary += f"\n... and {len(entries) - settings.RESULT_SUMMARY_MAX_ENTRIES} more results in the pages"
+
+    return (
+        f"{title}: {len(entries)} results stored in {pages_count} pages of {settings.RESULT_PAGE_SIZE} results.\n"
+        f"Read a page with the resource results://{handle}/{{page}} (pages 1 to {pages_count}).\n\n"
+        f"Summary:\n{summary}"
+    )
+
+
 @mcp.tool("get_workitems_ids_assigned_to_user")
+@with_request_id
 async def get_workitems_ids_assigned_to_user():
     """
     Get all workitems assigned to a user
@@ -35,6 +78,7 @@ async def get_workitems_ids_assigned_to_user():
 
 
 @mcp.tool("get_workitems_ids_assigned_to_user_by")
+@with_request_id
 async def get_workitems_ids_assigned_to_user_by(columns_where: str):
     """
     Get all workitems assigned to a user by a list of columns
@@ -56,6 +100,7 @@ async def get_workitems_ids_assigned_to_user_by(columns_where: str):
 
 
 @mcp.tool("get_workitems_ids_assigned_to_user_by_planned_date")
+@with_request_id
 async def get_workitems_ids_assigned_to_user_by_planned_date(planned_date: str):
     """
     Get all workitems assigned to a user by a planned date (Custom.FechaInicioPlaneada referenceName is required)
@@ -78,7 +123,93 @@ async def get_workitems_ids_assigned_to_user_by_planned_date(planned_date: str):
     return result
 
 
+@mcp.tool("search_workitems")
+@with_request_id
+async def search_workitems(query: str, limit: int = 10):
+    """
+    Search the workitems assigned to the user by keywords in their title, description and tags (faster than WIQL CONTAINS)
+
+    Args:
+        query: The keywords to search (e.g. "login error")
+        limit: The maximum number of results (e.g. 10)
+
+    Returns:
+        The matching workitems sorted from the best to the worst match
+
+    Example:
+        search_workitems("login error")
+        Returns:
+            12345 - [Bug] Login error on Safari (Active)
+    """
+    matches = await workitems.search_workitems(query, limit)
+
+    if matches:
+        result = "\n".join(
+            f"{match['id']} - [{match['workitem_type']}] {match['title']} ({match['state']})"
+            for match in matches
+        )
+    else:
+        result = "No workitems found"
+
+    return result
+
+
+@mcp.tool("get_workitems_ids_assigned_to_user_by_planned_date_range")
+@with_request_id
+async def get_workitems_ids_assigned_to_user_by_planned_date_range(
+    from_date: str, to_date: str
+):
+    """
+    Get all workitems assigned to a user planned between two dates, both included (Custom.FechaInicioPlaneada referenceName is required)
+
+    Args:
+        from_date: The first planned date (e.g. "2025-07-01")
+        to_date: The last planned date (e.g. "2025-07-07")
+
+    Returns:
+        A list of workitems assigned to the user
+    """
+    workitems_ids = (
+        await workitems.get_workitems_ids_assigned_to_user_by_planned_date_range(
+            from_date, to_date
+        )
+    )
+
+    if workitems_ids:
+        result = f"Workitems ids found: {','.join(workitems_ids)}"
+    else:
+        result = "No workitems found"
+
+    return result
+
+
+@mcp.tool("get_planning_calendar")
+@with_request_id
+async def get_planning_calendar(from_date: str, to_date: str):
+    """
+    Get the workitems assigned to the user grouped by planned day with the effort totals of each day (e.g. a weekly view)
+
+    Args:
+        from_date: The first planned date (e.g. "2025-07-01")
+        to_date: The last planned date (e.g. "2025-07-07")
+
+    Returns:
+        The workitems of each day with workitems and the effort totals
+    """
+    planning_days = await workitems.get_planning_calendar(from_date, to_date)
+
+    if planning_days:
+        result = "\n\n".join(
+            format_planning_day(planning_day) for planning_day in planning_days
+        )
+    else:
+        result = "No workitems found"
+
+    return result
+
+
 @mcp.tool("get_workitems_details_by_ids")
+@with_request_id
 async def get_workitems_details_by_ids(workitems_ids: str):
     """
     Get a workitem by its ID
@@ -92,8 +223,9 @@ async def get_workitems_details_by_ids(workitems_ids: str):
     workitems_details = await workitems.get_workitems_details_by_ids(workitems_ids)
 
     if workitems_details:
-        result = "\n\n".join(
-            format_workitem(workitem_detail) for workitem_detail in workitems_details
+        result = build_paged_result(
+            "Workitems details",
+            [format_workitem(workitem_detail) for workitem_detail in workitems_details],
         )
     else:
         result = "No workitems found"
@@ -101,7 +233,40 @@ async def get_workitems_details_by_ids(workitems_ids: str):
     return result
 
 
+@mcp.tool("get_workitem_hierarchy")
+@with_request_id
+async def get_workitem_hierarchy(
+    workitem_id: str, max_depth: int = 3, max_nodes: int = 500
+):
+    """
+    Get the whole tree of children of a workitem (e.g. Feature -> User Story -> Task) with its own effort and the effort of its children rolled up
+
+    Args:
+        workitem_id: The ID of the root workitem
+        max_depth: The maximum number of levels below the root workitem, at most 10 (e.g. 3)
+        max_nodes: The maximum number of workitems in the tree, at most 500 (e.g. 500)
+
+    Returns:
+        The tree of workitems, one per line and indented by level
+    """
+    root = await workitems.get_workitem_hierarchy(workitem_id, max_depth, max_nodes)
+
+    if root is None:
+        return "No workitems found"
+
+    result = build_paged_result(
+        f"Workitem {workitem_id} hierarchy",
+        format_workitem_tree(root).split("\n"),
+        separator="\n",
+    )
+    if root["truncated"]:
+        result += "\n\nThe tree was truncated by max_depth or max_nodes"
+
+    return result
+
+
 @mcp.tool("get_all_workitems_types")
+@with_request_id
 async def get_all_workitems_types():
     """
     Get all workitem types
@@ -110,14 +275,16 @@ async def get_all_workitems_types():
         A list of workitem types details
     """
     workitem_types = await workitems.get_all_workitems_types()
-    result = "\n\n".join(
-        format_workitem_type(workitem_type) for workitem_type in workitem_types
+    result = build_paged_result(
+        "Workitem types",
+        [format_workitem_type(workitem_type) for workitem_type in workitem_types],
     )
 
     return result
 
 
 @mcp.tool("get_workitem_type_by_name")
+@with_request_id
 async def get_workitem_type_by_name(name: str):
     """
     Get a workitem type by its name
@@ -135,6 +302,7 @@ async def get_workitem_type_by_name(name: str):
 
 
 @mcp.tool("get_workitem_type_states")
+@with_request_id
 async def get_workitem_type_states(workitem_type_name: str):
     """
     Get all workitem type states
@@ -155,6 +323,7 @@ async def get_workitem_type_states(workitem_type_name: str):
 
 
 @mcp.tool("get_workitem_transitions_allowed")
+@with_request_id
 async def get_workitem_transitions_allowed(
     workitem_type_name: str, workitem_state_name: str
 ):
@@ -185,7 +354,40 @@ async def get_workitem_transitions_allowed(
     return result
 
 
+@mcp.tool("get_workitem_transition_path")
+@with_request_id
+async def get_workitem_transition_path(
+    workitem_type_name: str, from_state_name: str, to_state_name: str
+):
+    """
+    Get the shortest legal sequence of states to move a workitem from one state to another
+
+    Args:
+        workitem_type_name: The name of the workitem type (e.g. "Task", "Bug", "Feature")
+        from_state_name: The name of the current state (e.g. "New")
+        to_state_name: The name of the target state (e.g. "Closed")
+
+    Returns:
+        The states to go through, including the current and the target ones
+
+    Example:
+        get_workitem_transition_path("Bug", "New", "Closed")
+        Returns:
+            New (Proposed) -> Active (InProgress) -> Resolved (Resolved) -> Closed (Completed)
+    """
+    graph = await workitems.get_workitem_transition_graph(workitem_type_name)
+    path = graph.find_shortest_path(from_state_name, to_state_name)
+
+    if path:
+        result = format_workitem_transition_path(path, graph.categories)
+    else:
+        result = "No transition path found between these workitem states"
+
+    return result
+
+
 @mcp.tool("update_workitem_state")
+@with_request_id
 async def update_workitem_state(workitem_id: str, workitem_state_name: str):
     """
     Update the state of a workitem
@@ -206,6 +408,7 @@ async def update_workitem_state(workitem_id: str, workitem_state_name: str):
 
 
 @mcp.tool("update_workitem_planned_date")
+@with_request_id
 async def update_workitem_planned_date(workitem_id: str, planned_date: str):
     """
     Update the planned date of a workitem
@@ -226,6 +429,7 @@ async def update_workitem_planned_date(workitem_id: str, planned_date: str):
 
 
 @mcp.tool("update_workitem_real_effort")
+@with_request_id
 async def update_workitem_real_effort(workitem_id: str, real_effort: str):
     """
     Update the real effort of a workitem
@@ -246,6 +450,7 @@ async def update_workitem_real_effort(workitem_id: str, real_effort: str):
 
 
 @mcp.tool("update_workitem_description")
+@with_request_id
 async def update_workitem_description(workitem_id: str, description: str):
     """
     Update the description of a workitem
@@ -266,6 +471,7 @@ async def update_workitem_description(workitem_id: str, description: str):
 
 
 @mcp.tool("update_workitems_planned_date")
+@with_request_id
 async def update_workitems_planned_date(workitems_ids: str, planned_date: str):
     """
     Update the planned date of a list of workitems
@@ -285,7 +491,109 @@ async def update_workitems_planned_date(workitems_ids: str, planned_date: str):
         return "Failed to update workitems planned date"
 
 
+@mcp.tool("update_workitems_state_by_path")
+@with_request_id
+async def update_workitems_state_by_path(workitems_ids: str, workitem_state_name: str):
+    """
+    Move a list of workitems to a state, going through the intermediate states required by each workitem type
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        workitem_state_name: The name of the target workitem state (e.g. "Closed")
+
+    Returns:
+        A message with the result of the operation
+    """
+    result = await workitems.update_workitems_state_by_path(
+        workitems_ids, workitem_state_name
+    )
+
+    if result:
+        return f"Workitems state updated successfully: {','.join(result)}"
+    else:
+        return "Failed to update workitems state"
+
+
+@mcp.tool("create_workitems")
+@with_request_id
+async def create_workitems(workitems_specs: list[dict]):
+    """
+    Create many workitems at once (e.g. split a user story into tasks)
+
+    Args:
+        workitems_specs: A list of workitems to create, each one with the keys "type" and "title"
+            and optionally "planned_date" (e.g. "2025-07-02T00:00:00Z"), "effort" (e.g. "2.5"),
+            "description" and "parent_id" (the ID of an existing workitem)
+
+    Returns:
+        The ID of each created workitem or the error of each workitem that was not created
+
+    Example:
+        create_workitems([{"type": "Task", "title": "Write tests", "effort": "2", "parent_id": "123"}])
+        Returns:
+            Write tests -> 124
+    """
+    results = await workitems.create_workitems(workitems_specs)
+
+    if not results:
+        return "No workitems to create"
+
+    return "\n".join(
+        f"{result['title']} -> {result['id']}"
+        if result["id"]
+        else f"{result['title']} -> Failed: {result['error']}"
+        for result in results
+    )
+
+
+@mcp.tool("add_workitem_attachment")
+@with_request_id
+async def add_workitem_attachment(workitem_id: str, file_path: str, comment: str = ""):
+    """
+    Upload a local file and attach it to a workitem
+
+    Args:
+        workitem_id: The ID of the workitem
+        file_path: The path of the file to upload, relative to the attachments directory (e.g. "error.png")
+        comment: The comment of the attachment (e.g. "Screenshot of the error")
+
+    Returns:
+        A message with the result of the operation
+    """
+    result = await workitems.add_workitem_attachment(workitem_id, file_path, comment)
+
+    if result:
+        return "Workitem attachment added successfully"
+    else:
+        return "Failed to add workitem attachment"
+
+
+@mcp.tool("download_workitem_attachment")
+@with_request_id
+async def download_workitem_attachment(
+    attachment_id: str, file_path: str, overwrite: bool = False
+):
+    """
+    Download an attachment of a workitem to a local file
+
+    Args:
+        attachment_id: The ID (GUID) or the URL of the attachment (found in the AttachedFile relations of the workitem)
+        file_path: The path where the file is saved, relative to the attachments directory (e.g. "error.png")
+        overwrite: Replace the file if it already exists (e.g. False)
+
+    Returns:
+        A message with the result of the operation
+    """
+    written = await workitems.download_attachment(attachment_id, file_path, overwrite)
+
+    if written is None:
+        return "Failed to download workitem attachment"
+
+    return f"Attachment downloaded successfully: {file_path} ({written} bytes)"
+
+
 @mcp.tool("add_workitem_comment")
+@with_request_id
 async def add_workitem_comment(workitem_id: str, comment: str):
     """
     Add a comment to a workitem
@@ -305,5 +613,105 @@ async def add_workitem_comment(workitem_id: str, comment: str):
         return "Failed to add workitem comment"
 
 
+@mcp.tool("get_workitems_comments")
+@with_request_id
+async def get_workitems_comments(workitems_ids: str, since_comment_id: int = 0):
+    """
+    Get the comments (discussion) of a list of workitems
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        since_comment_id: Only return the comments with a greater ID, to read only the new ones (e.g. 12)
+
+    Returns:
+        The comments of each workitem from the oldest to the newest
+    """
+    workitems_comments = await workitems.get_workitems_comments(
+        workitems_ids, since_comment_id
+    )
+
+    entries = []
+    for workitem_id, result in workitems_comments.items():
+        if result["error"]:
+            # The cached comments are still shown, after the error
+            entries.append(
+                f"Workitem {workitem_id} - Failed to get comments: {result['error']}"
+            )
+        elif not result["comments"]:
+            entries.append(f"Workitem {workitem_id} - No comments found")
+        entries.extend(
+            f"Workitem {workitem_id} - {format_workitem_comment(comment)}"
+            for comment in result["comments"]
+        )
+
+    return build_paged_result("Workitems comments", entries)
+
+
+@mcp.tool("get_workitems_changes")
+@with_request_id
+async def get_workitems_changes(
+    workitems_ids: str, since_date: str = "", since_rev: int = 0
+):
+    """
+    Get what changed on a list of workitems (field by field) since a date or a revision
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        since_date: Only return the changes made on or after this date (e.g. "2025-07-02")
+        since_rev: Only return the changes of a greater revision (e.g. 10)
+
+    Returns:
+        The changes of each workitem from the oldest to the newest
+    """
+    workitems_updates = await workitems.get_workitems_updates(
+        workitems_ids, since_date, since_rev
+    )
+
+    entries = []
+    for workitem_id, result in workitems_updates.items():
+        if result["error"]:
+            # The changes downloaded before the error are still shown, after it
+            entries.append(
+                f"Workitem {workitem_id} - Failed to get changes: {result['error']}"
+            )
+        elif not result["updates"]:
+            entries.append(f"Workitem {workitem_id} - No changes found")
+        entries.extend(
+            f"Workitem {workitem_id} - {format_workitem_update(update)}"
+            for update in result["updates"]
+        )
+
+    return build_paged_result("Workitems changes", entries)
+
+
+@mcp.tool("get_scheduler_metrics")
+@with_request_id
+async def get_scheduler_metrics():
+    """
+    Get the running and queued requests to the Azure DevOps API
+
+    Returns:
+        The queue depth and the running requests (global and per endpoint)
+    """
+    return format_scheduler_metrics(scheduler.get_metrics())
+
+
+@mcp.resource("results://{handle}/{page}")
+def get_result_page(handle: str, page: str):
+    """
+    Get a page of a large result stored by a tool
+
+    Args:
+        handle: The handle of the result returned by the tool
+        page: The number of the page, starting at 1
+    """
+    result = result_store.get_page(handle, int(page))
+
+    if result is None:
+        raise ValueError(f"Result page not found or expired: {handle}/{page}")
+
+    return result
+
+
 if __name__ == "__main__":
     mcp.run()
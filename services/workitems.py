@@ -1,7 +1,76 @@
+import asyncio
+import json
+import os
+import time
+from urllib.parse import quote
+
 import httpx
 
 from settings import settings
-from utils.http_client import make_get_request, make_patch_request, make_post_request
+from utils import scheduler, workitem_types_cache
+from utils.http_client import (
+    download_file,
+    make_binary_request,
+    make_get_request,
+    make_patch_request,
+    make_post_request,
+)
+from utils.item_cache import ItemCache
+from utils.logger import get_logger
+from utils.planning_index import PlanningIndex
+from utils.scheduler import Priority
+from utils.search_index import SearchIndex
+from utils.transition_graph import TransitionGraph, get_transition_graph
+
+logger = get_logger(__name__)
+
+workitem_types_fetch_task: asyncio.Task | None = None
+
+comments_cache = ItemCache(settings.ITEM_CACHE_MAX_ITEMS)
+updates_cache = ItemCache(settings.ITEM_CACHE_MAX_ITEMS)
+
+search_index = SearchIndex(
+    settings.SEARCH_INDEX_MAX_DOCUMENTS, settings.SEARCH_INDEX_MAX_TERMS_PER_DOCUMENT
+)
+search_index_refreshed_at = 0.0
+search_index_full_refreshed_at = 0.0
+search_index_refresh_task: asyncio.Task | None = None
+search_index_built = False
+
+SEARCH_INDEX_FIELDS = [
+    "System.Title",
+    "System.Description",
+    "System.Tags",
+    "System.ChangedDate",
+    "System.WorkItemType",
+    "System.State",
+]
+
+planning_index = PlanningIndex()
+planning_index_refreshed_at = 0.0
+planning_index_full_refreshed_at = 0.0
+
+PLANNING_INDEX_FIELDS = [
+    "System.Title",
+    "System.WorkItemType",
+    "System.State",
+    "System.ChangedDate",
+    "Custom.FechaInicioPlaneada",
+    "Microsoft.VSTS.Scheduling.Effort",
+    "Custom.RealEffort",
+]
+
+# Fields that change on every revision and only add noise to the diffs
+IGNORED_UPDATE_FIELDS = {
+    "System.Rev",
+    "System.AuthorizedDate",
+    "System.RevisedDate",
+    "System.ChangedDate",
+    "System.ChangedBy",
+    "System.AuthorizedAs",
+    "System.PersonId",
+    "System.Watermark",
+}
 
 
 async def get_workitems_ids_assigned_to_user() -> list[str]:
@@ -74,6 +143,35 @@ async def get_workitems_ids_assigned_to_user_by_planned_date(
     return workitems_ids
 
 
+async def get_workitems_ids_assigned_to_user_by_planned_date_range(
+    from_date: str, to_date: str
+) -> list[str]:
+    """
+    Get all workitems assigned to a user planned between two dates (both included)
+
+    Args:
+        from_date: The first planned date (e.g. "2025-07-01")
+        to_date: The last planned date (e.g. "2025-07-07")
+
+    Returns:
+        A list of workitems assigned to the user
+    """
+    url = f"{settings.AZURE_DEVOPS_BASE_URL}/wiql?api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    data = {
+        "query": build_query_to_get_workitems_ids_assigned_to_user_by_planned_date_range(
+            from_date, to_date
+        )
+    }
+
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+    response = await make_post_request(url, "POST", data, credentials=credentials)
+    workitems = response.get("workItems", [])
+
+    workitems_ids = [str(workitem["id"]) for workitem in workitems]
+
+    return workitems_ids
+
+
 async def get_workitems_details_by_ids(workitems_ids: str) -> list[dict]:
     """
     Get all workitems details by their IDs
@@ -87,25 +185,208 @@ async def get_workitems_details_by_ids(workitems_ids: str) -> list[dict]:
 
     url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems?ids={workitems_ids}&api-version={settings.AZURE_DEVOPS_API_VERSION}"
     credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
-    print(url)
     try:
         response = await make_get_request(url, credentials=credentials)
         return response.get("value", [])
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
-            print(f"Workitems not found: {workitems_ids}")
+            logger.warning(
+                "workitems_not_found",
+                extra={"fields": {"workitems_ids": workitems_ids}},
+            )
             return []
         else:
-            print(f"Error getting workitems details by ids: {e}")
+            logger.error(
+                "get_workitems_details_failed",
+                extra={"fields": {"workitems_ids": workitems_ids, "error": str(e)}},
+            )
             raise e
     except Exception as e:
-        print(f"Error getting workitems details by ids: {e}")
+        logger.error(
+            "get_workitems_details_failed",
+            extra={"fields": {"workitems_ids": workitems_ids, "error": str(e)}},
+        )
         return []
 
 
+async def get_workitems_in_chunks(
+    workitems_ids: list[str],
+    query_params: str,
+    priority: Priority = Priority.INTERACTIVE,
+) -> list[dict]:
+    """
+    Get workitems in concurrent chunks of the maximum IDs per request
+
+    Args:
+        workitems_ids: A list of workitem IDs (e.g. ["1", "2", "3"])
+        query_params: The extra query parameters of each request (e.g. "$expand=relations")
+        priority: The priority class of the requests
+
+    Returns:
+        A list of workitems details (missing workitems are omitted)
+    """
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+
+    async def get_chunk(chunk: list[str]) -> list[dict]:
+        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems?ids={','.join(chunk)}&{query_params}&errorPolicy=omit&api-version={settings.AZURE_DEVOPS_API_VERSION}"
+        response = await make_get_request(url, credentials=credentials)
+        return [workitem for workitem in response.get("value", []) if workitem]
+
+    chunk_size = settings.WORKITEMS_BATCH_SIZE
+    chunks = await scheduler.gather(
+        *(
+            get_chunk(workitems_ids[index : index + chunk_size])
+            for index in range(0, len(workitems_ids), chunk_size)
+        ),
+        priority=priority,
+    )
+
+    return [workitem for chunk in chunks for workitem in chunk]
+
+
+async def get_workitems_with_relations(workitems_ids: list[str]) -> list[dict]:
+    """
+    Get the details and relations of workitems
+
+    Args:
+        workitems_ids: A list of workitem IDs (e.g. ["1", "2", "3"])
+
+    Returns:
+        A list of workitems details with their relations (missing workitems are omitted)
+    """
+    return await get_workitems_in_chunks(workitems_ids, "$expand=relations")
+
+
+async def get_workitem_hierarchy(
+    workitem_id: str, max_depth: int = 3, max_nodes: int = 500
+) -> dict | None:
+    """
+    Get the tree of children of a workitem, walking the hierarchy breadth-first one level per request batch
+
+    Args:
+        workitem_id: The ID of the root workitem
+        max_depth: The maximum number of levels below the root workitem, up to HIERARCHY_MAX_DEPTH (e.g. 3)
+        max_nodes: The maximum number of workitems in the tree, up to HIERARCHY_MAX_NODES (e.g. 500)
+
+    Returns:
+        The root node of the tree or None if the workitem was not found. Each node has the
+        keys "workitem", "children", "effort", "real_effort" (of the workitem itself),
+        "children_effort", "children_real_effort" (rolled up from all its descendants)
+        and the root node also has "truncated" (True if a limit was reached)
+    """
+    # The limits come from the tool caller, so they are capped on the server
+    max_depth = max(0, min(max_depth, settings.HIERARCHY_MAX_DEPTH))
+    max_nodes = max(1, min(max_nodes, settings.HIERARCHY_MAX_NODES))
+
+    nodes: dict[str, dict] = {}
+    children_ids: dict[str, list[str]] = {}
+    visited = {workitem_id}
+    level = [workitem_id]
+    truncated = False
+
+    for depth in range(max_depth + 1):
+        for workitem in await get_workitems_with_relations(level):
+            node_id = str(workitem["id"])
+            nodes[node_id] = {"workitem": workitem, "children": []}
+            children_ids[node_id] = get_workitem_children_ids(workitem)
+
+        next_level = []
+        for node_id in level:
+            for child_id in children_ids.get(node_id, []):
+                if child_id in visited:
+                    continue
+                if depth == max_depth or len(visited) >= max_nodes:
+                    truncated = True
+                    continue
+                visited.add(child_id)
+                next_level.append(child_id)
+
+        if not next_level:
+            break
+        level = next_level
+
+    if workitem_id not in nodes:
+        return None
+
+    def build_node(node_id: str) -> dict:
+        node = nodes[node_id]
+        fields = node["workitem"].get("fields", {})
+        node["effort"] = float(fields.get("Microsoft.VSTS.Scheduling.Effort") or 0)
+        node["real_effort"] = float(fields.get("Custom.RealEffort") or 0)
+        node["children_effort"] = 0.0
+        node["children_real_effort"] = 0.0
+
+        for child_id in children_ids.get(node_id, []):
+            # A workitem reached from several parents only appears under the first one
+            if child_id in nodes and "effort" not in nodes[child_id]:
+                child = build_node(child_id)
+                node["children"].append(child)
+                node["children_effort"] += child["effort"] + child["children_effort"]
+                node["children_real_effort"] += (
+                    child["real_effort"] + child["children_real_effort"]
+                )
+
+        return node
+
+    root = build_node(workitem_id)
+    root["truncated"] = truncated
+
+    return root
+
+
+def get_workitem_children_ids(workitem: dict) -> list[str]:
+    """
+    Get the IDs of the children of a workitem from its relations
+
+    Args:
+        workitem: A workitem with its relations
+
+    Returns:
+        A list of workitem IDs
+    """
+    return [
+        relation["url"].rsplit("/", 1)[-1]
+        for relation in workitem.get("relations") or []
+        if relation.get("rel") == "System.LinkTypes.Hierarchy-Forward"
+    ]
+
+
 async def get_all_workitems_types() -> list[dict]:
     """
-    Get all workitem types
+    Get all workitem types (served from the on-disk cache when available)
+
+    Returns:
+        A list of workitem types
+    """
+    workitem_types = workitem_types_cache.load_workitem_types()
+    if workitem_types is not None:
+        workitem_types_cache.schedule_revalidation(fetch_all_workitems_types)
+        return workitem_types
+
+    return await fetch_all_workitems_types()
+
+
+async def fetch_all_workitems_types() -> list[dict]:
+    """
+    Download all workitem types and refresh the workitem types cache
+
+    Concurrent callers share a single download.
+
+    Returns:
+        A list of workitem types
+    """
+    global workitem_types_fetch_task
+
+    if workitem_types_fetch_task is None or workitem_types_fetch_task.done():
+        workitem_types_fetch_task = asyncio.create_task(download_all_workitems_types())
+
+    # Shielded so a cancelled caller does not cancel the download of the others
+    return await asyncio.shield(workitem_types_fetch_task)
+
+
+async def download_all_workitems_types() -> list[dict]:
+    """
+    Download all workitem types and save them in the workitem types cache
 
     Returns:
         A list of workitem types
@@ -114,7 +395,7 @@ async def get_all_workitems_types() -> list[dict]:
     credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
     response = await make_get_request(url, credentials=credentials)
 
-    return response.get("value", [])
+    return workitem_types_cache.save_workitem_types(response.get("value", []))
 
 
 async def get_workitem_type_by_name(name: str) -> dict:
@@ -127,6 +408,11 @@ async def get_workitem_type_by_name(name: str) -> dict:
     Returns:
         A workitem type
     """
+    await get_all_workitems_types()
+    workitem_type = workitem_types_cache.get_cached_workitem_type(name)
+    if workitem_type is not None:
+        return workitem_type
+
     url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitemtypes/{name}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
     credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
 
@@ -145,6 +431,11 @@ async def get_workitem_type_states(workitem_type_name: str) -> list[dict]:
     Returns:
         A list of workitem type states
     """
+    await get_all_workitems_types()
+    workitem_type = workitem_types_cache.get_cached_workitem_type(workitem_type_name)
+    if workitem_type is not None:
+        return workitem_type.get("states", [])
+
     url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitemtypes/{workitem_type_name}/states?api-version={settings.AZURE_DEVOPS_API_VERSION}"
     credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
     response = await make_get_request(url, credentials=credentials)
@@ -183,6 +474,20 @@ async def get_workitem_transitions_allowed(
     return workitem_type_transitions.get(workitem_state_name, [])
 
 
+async def get_workitem_transition_graph(workitem_type_name: str) -> TransitionGraph:
+    """
+    Get the precompiled state transition graph of a workitem type
+
+    Args:
+        workitem_type_name: The name of the workitem type (e.g. "Task", "Bug", "Feature")
+
+    Returns:
+        The transition graph of the workitem type
+    """
+    workitem_type = await get_workitem_type_by_name(workitem_type_name)
+    return get_transition_graph(workitem_type)
+
+
 async def update_workitem_state(workitem_id: str, workitem_state_name: str) -> bool:
     """
     Update the state of a workitem
@@ -200,17 +505,105 @@ async def update_workitem_state(workitem_id: str, workitem_state_name: str) -> b
             }
         ]
 
-        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
-        credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
-
-        await make_patch_request(url, body, credentials=credentials)
+        await patch_workitem(workitem_id, body)
 
         return True
     except Exception as e:
-        print(f"Error updating workitem state: {e}")
+        logger.error(
+            "update_workitem_state_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
         return False
 
 
+async def update_workitems_state_by_path(
+    workitems_ids: str, workitem_state_name: str
+) -> list[str]:
+    """
+    Move a list of workitems to a state following the shortest legal path of each workitem type
+
+    Workitems already in the target state are not modified. Each workitem is moved
+    one state at a time and the workitems are updated concurrently.
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        workitem_state_name: The name of the target workitem state (e.g. "Closed")
+
+    Returns:
+        A list of workitems IDs that reached the target state
+    """
+    workitems_details = await get_workitems_in_chunks(
+        workitems_ids.split(","), "fields=System.WorkItemType,System.State"
+    )
+
+    # Resolve each workitem type once before moving the workitems concurrently
+    graphs: dict[str, TransitionGraph | None] = {}
+    for workitem in workitems_details:
+        workitem_type_name = workitem.get("fields", {}).get("System.WorkItemType", "")
+        if workitem_type_name in graphs:
+            continue
+
+        try:
+            graphs[workitem_type_name] = await get_workitem_transition_graph(
+                workitem_type_name
+            )
+        except Exception as e:
+            logger.error(
+                "get_workitem_transition_graph_failed",
+                extra={
+                    "fields": {
+                        "workitem_type_name": workitem_type_name,
+                        "error": str(e),
+                    }
+                },
+            )
+            graphs[workitem_type_name] = None
+
+    async def move_workitem(workitem: dict) -> str | None:
+        workitem_id = str(workitem.get("id"))
+        fields = workitem.get("fields", {})
+        graph = graphs[fields.get("System.WorkItemType", "")]
+        if graph is None:
+            logger.warning(
+                "transition_path_not_found",
+                extra={
+                    "fields": {
+                        "workitem_id": workitem_id,
+                        "workitem_state_name": workitem_state_name,
+                        "error": "The workitem type could not be resolved",
+                    }
+                },
+            )
+            return None
+
+        path = graph.find_shortest_path(
+            fields.get("System.State", ""), workitem_state_name
+        )
+        if path is None:
+            logger.warning(
+                "transition_path_not_found",
+                extra={
+                    "fields": {
+                        "workitem_id": workitem_id,
+                        "workitem_state_name": workitem_state_name,
+                    }
+                },
+            )
+            return None
+
+        for state_name in path[1:]:
+            if not await update_workitem_state(workitem_id, state_name):
+                return None
+
+        return workitem_id
+
+    results = await scheduler.gather(
+        *(move_workitem(workitem) for workitem in workitems_details)
+    )
+
+    return [workitem_id for workitem_id in results if workitem_id is not None]
+
+
 async def update_workitems_planned_date(
     workitems_ids: str, planned_date: str
 ) -> list[str]:
@@ -225,13 +618,56 @@ async def update_workitems_planned_date(
         A list of workitems IDs that were updated
     """
     workitems_ids_list = workitems_ids.split(",")
-    workitems_ids_list_updated = []
-    for workitem_id in workitems_ids_list:
-        updated = await update_workitem_planned_date(workitem_id, planned_date)
-        if updated:
-            workitems_ids_list_updated.append(workitem_id)
+    updated = await scheduler.gather(
+        *(
+            update_workitem_planned_date(workitem_id, planned_date)
+            for workitem_id in workitems_ids_list
+        )
+    )
 
-    return workitems_ids_list_updated
+    return [
+        workitem_id
+        for workitem_id, workitem_updated in zip(workitems_ids_list, updated)
+        if workitem_updated
+    ]
+
+
+def invalidate_planning_workitem(workitem_id: str) -> None:
+    """
+    Remove a workitem changed by the user from the planning index until the next refresh
+
+    The PATCH and $batch responses do not tell if the workitem is assigned to the
+    user, so it is loaded again by the next refresh, which only returns the
+    workitems assigned to the user. Every PATCH goes through patch_workitem,
+    so the calendar never shows a stale state or title.
+
+    Args:
+        workitem_id: The ID of the workitem
+    """
+    global planning_index_refreshed_at
+
+    planning_index.remove_workitem(workitem_id)
+    planning_index_refreshed_at = 0.0
+
+
+async def patch_workitem(workitem_id: str, body: list[dict]) -> dict:
+    """
+    Apply a JSON patch to a workitem and drop it from the planning index until the next refresh
+
+    Args:
+        workitem_id: The ID of the workitem
+        body: The JSON patch operations (e.g. [{"op": "add", "path": "/fields/System.State", "value": "Done"}])
+
+    Returns:
+        The updated workitem
+    """
+    url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+
+    workitem = await make_patch_request(url, body, credentials=credentials)
+    invalidate_planning_workitem(workitem_id)
+
+    return workitem
 
 
 async def update_workitem_planned_date(workitem_id: str, planned_date: str) -> bool:
@@ -254,14 +690,14 @@ async def update_workitem_planned_date(workitem_id: str, planned_date: str) -> b
             }
         ]
 
-        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
-        credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
-
-        await make_patch_request(url, body, credentials=credentials)
+        await patch_workitem(workitem_id, body)
 
         return True
     except Exception as e:
-        print(f"Error updating workitem planned date: {e}")
+        logger.error(
+            "update_workitem_planned_date_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
         return False
 
 
@@ -285,14 +721,14 @@ async def update_workitem_real_effort(workitem_id: str, real_effort: str) -> boo
             }
         ]
 
-        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
-        credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
-
-        await make_patch_request(url, body, credentials=credentials)
+        await patch_workitem(workitem_id, body)
 
         return True
     except Exception as e:
-        print(f"Error updating workitem real effort: {e}")
+        logger.error(
+            "update_workitem_real_effort_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
         return False
 
 
@@ -316,14 +752,14 @@ async def update_workitem_description(workitem_id: str, description: str) -> boo
             }
         ]
 
-        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
-        credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
-
-        await make_patch_request(url, body, credentials=credentials)
+        await patch_workitem(workitem_id, body)
 
         return True
     except Exception as e:
-        print(f"Error updating workitem description: {e}")
+        logger.error(
+            "update_workitem_description_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
         return False
 
 
@@ -347,17 +783,673 @@ async def add_workitem_comment(workitem_id: str, comment: str) -> bool:
             }
         ]
 
-        url = f"{settings.AZURE_DEVOPS_BASE_URL}/workitems/{workitem_id}?api-version={settings.AZURE_DEVOPS_API_VERSION}"
-        credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+        await patch_workitem(workitem_id, body)
+
+        return True
+    except Exception as e:
+        logger.error(
+            "add_workitem_comment_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
+        return False
+
 
-        await make_patch_request(url, body, credentials=credentials)
+async def create_workitems(workitems_specs: list[dict]) -> list[dict]:
+    """
+    Create many workitems with $batch requests of up to WORKITEMS_CREATE_BATCH_SIZE workitems each
+
+    Args:
+        workitems_specs: A list of workitems to create, each one with the keys "type" and "title"
+            and optionally "planned_date", "effort", "description" and "parent_id"
+            (e.g. [{"type": "Task", "title": "Write tests", "effort": "2.5", "parent_id": "123"}])
+
+    Returns:
+        A list with one result per spec in the same order, each one with the keys
+        "title", "id" (None if the workitem was not created) and "error"
+    """
+    results = [
+        {
+            "title": spec.get("title") if isinstance(spec, dict) else None,
+            "id": None,
+            "error": None,
+        }
+        for spec in workitems_specs
+    ]
+    batch_requests = []
+    for index, spec in enumerate(workitems_specs):
+        if (
+            not isinstance(spec, dict)
+            or not isinstance(spec.get("type"), str)
+            or not isinstance(spec.get("title"), str)
+            or not spec["type"]
+            or not spec["title"]
+        ):
+            results[index]["error"] = (
+                "The keys 'type' and 'title' are required and must be strings"
+            )
+            continue
+        batch_requests.append((index, build_workitem_create_request(spec)))
+
+    url = f"{settings.AZURE_DEVOPS_ORGANIZATION_URL}/_apis/wit/$batch?api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+
+    async def send_batch(batch: list[tuple[int, dict]]) -> None:
+        try:
+            response = await make_post_request(
+                url,
+                "POST",
+                [request for _, request in batch],
+                credentials=credentials,
+            )
+            responses = response.get("value", [])
+            if not isinstance(responses, list):
+                raise ValueError("The batch response has no list of responses")
+        except Exception as e:
+            logger.error(
+                "create_workitems_batch_failed",
+                extra={"fields": {"workitems": len(batch), "error": str(e)}},
+            )
+            responses = []
+
+        for position, (index, _) in enumerate(batch):
+            if position >= len(responses):
+                results[index]["error"] = "The batch request failed"
+                continue
+
+            try:
+                body = responses[position].get("body")
+                body = (
+                    json.loads(body) if isinstance(body, str) and body else body or {}
+                )
+                if responses[position].get("code") == 200:
+                    results[index]["id"] = str(body["id"])
+                    invalidate_planning_workitem(results[index]["id"])
+                else:
+                    results[index]["error"] = (body.get("value") or {}).get(
+                        "Message", body.get("message", "Unknown error")
+                    )
+            except Exception as e:
+                logger.error(
+                    "create_workitems_response_invalid",
+                    extra={"fields": {"position": position, "error": str(e)}},
+                )
+                results[index]["error"] = f"Invalid batch response: {e}"
+
+    batch_size = settings.WORKITEMS_CREATE_BATCH_SIZE
+    await scheduler.gather(
+        *(
+            send_batch(batch_requests[index : index + batch_size])
+            for index in range(0, len(batch_requests), batch_size)
+        )
+    )
+
+    return results
+
+
+def build_workitem_create_request(spec: dict) -> dict:
+    """
+    Build the $batch request that creates a workitem
+
+    Args:
+        spec: The workitem to create (see create_workitems)
+
+    Returns:
+        The $batch request
+    """
+    fields = {
+        "System.Title": spec.get("title"),
+        "Custom.FechaInicioPlaneada": spec.get("planned_date"),
+        "Microsoft.VSTS.Scheduling.Effort": spec.get("effort"),
+        "System.Description": spec.get("description"),
+    }
+    body = [
+        {"op": "add", "path": f"/fields/{reference_name}", "value": value}
+        for reference_name, value in fields.items()
+        if value is not None
+    ]
+
+    if spec.get("parent_id"):
+        body.append(
+            {
+                "op": "add",
+                "path": "/relations/-",
+                "value": {
+                    "rel": "System.LinkTypes.Hierarchy-Reverse",
+                    "url": f"{settings.AZURE_DEVOPS_BASE_URL}/workItems/{spec['parent_id']}",
+                },
+            }
+        )
+
+    return {
+        "method": "PATCH",
+        "uri": f"/{quote(settings.AZURE_DEVOPS_PROJECT)}/_apis/wit/workitems/${quote(spec['type'])}?api-version={settings.AZURE_DEVOPS_API_VERSION}",
+        "headers": {"Content-Type": "application/json-patch+json"},
+        "body": body,
+    }
+
+
+def resolve_attachment_path(file_path: str) -> str:
+    """
+    Resolve the path of an attachment file inside the attachments directory
+
+    Args:
+        file_path: The path of the file, relative to ATTACHMENTS_DIR or absolute (e.g. "error.png")
+
+    Returns:
+        The absolute path of the file with the symbolic links resolved
+
+    Raises:
+        ValueError: If the file is outside the attachments directory
+    """
+    attachments_dir = os.path.realpath(settings.ATTACHMENTS_DIR)
+    path = os.path.realpath(os.path.join(attachments_dir, file_path))
+    if os.path.commonpath([attachments_dir, path]) != attachments_dir:
+        raise ValueError(
+            f"The file {file_path} is outside the attachments directory {attachments_dir}"
+        )
+
+    return path
+
+
+async def upload_attachment(file_path: str, file_name: str = "") -> dict:
+    """
+    Upload a file as an attachment in chunks streamed from disk
+
+    At most ATTACHMENT_MAX_CONCURRENT_CHUNKS chunks of ATTACHMENT_CHUNK_SIZE bytes
+    are read and uploaded at once, so the memory used does not depend on the file size.
+
+    Args:
+        file_path: The path of the file to upload, inside ATTACHMENTS_DIR (e.g. "error.png")
+        file_name: The name of the attachment (defaults to the name of the file)
+
+    Returns:
+        The attachment with the keys "id" and "url"
+    """
+    file_path = resolve_attachment_path(file_path)
+    file_name = file_name or os.path.basename(file_path)
+    file_size = os.path.getsize(file_path)
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+
+    url = f"{settings.AZURE_DEVOPS_BASE_URL}/attachments?fileName={quote(file_name)}&uploadType=Chunked&api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    attachment = await make_binary_request(url, "POST", credentials=credentials)
+
+    chunk_url = f"{settings.AZURE_DEVOPS_BASE_URL}/attachments/{attachment['id']}?fileName={quote(file_name)}&api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    chunk_size = settings.ATTACHMENT_CHUNK_SIZE
+    # Shared by the workers, each one takes the next offset when it is free
+    offsets = iter(range(0, file_size, chunk_size))
+
+    def read_chunk(offset: int) -> bytes:
+        with open(file_path, "rb") as file:
+            file.seek(offset)
+            return file.read(chunk_size)
+
+    async def upload_chunks() -> None:
+        for offset in offsets:
+            chunk = await asyncio.to_thread(read_chunk, offset)
+            await make_binary_request(
+                chunk_url,
+                "PUT",
+                chunk,
+                headers={
+                    "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{file_size}"
+                },
+                credentials=credentials,
+            )
+
+    # A fixed pool of workers, so the tasks do not grow with the file size and
+    # the first failed chunk cancels the others
+    workers_count = min(
+        settings.ATTACHMENT_MAX_CONCURRENT_CHUNKS, -(-file_size // chunk_size)
+    )
+    await scheduler.gather(*(upload_chunks() for _ in range(workers_count)))
+
+    return attachment
+
+
+async def add_workitem_attachment(
+    workitem_id: str, file_path: str, comment: str = ""
+) -> bool:
+    """
+    Upload a file and attach it to a workitem
+
+    Args:
+        workitem_id: The ID of the workitem
+        file_path: The path of the file to upload, inside ATTACHMENTS_DIR (e.g. "error.png")
+        comment: The comment of the attachment (e.g. "Screenshot of the error")
+
+    Returns:
+        True if the file was attached, False otherwise
+    """
+    try:
+        attachment = await upload_attachment(file_path)
+
+        body = [
+            {
+                "op": "add",
+                "path": "/relations/-",
+                "value": {
+                    "rel": "AttachedFile",
+                    "url": attachment["url"],
+                    "attributes": {"comment": comment},
+                },
+            }
+        ]
+
+        await patch_workitem(workitem_id, body)
 
         return True
     except Exception as e:
-        print(f"Error adding workitem comment: {e}")
+        logger.error(
+            "add_workitem_attachment_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
         return False
 
 
+async def download_attachment(
+    attachment_id: str, file_path: str, overwrite: bool = False
+) -> int | None:
+    """
+    Download an attachment to disk, streamed in chunks
+
+    Args:
+        attachment_id: The ID (GUID) or the URL of the attachment
+        file_path: The path where the file is saved, inside ATTACHMENTS_DIR (e.g. "error.png")
+        overwrite: Replace the file if it already exists
+
+    Returns:
+        The number of bytes written or None if the attachment was not downloaded
+    """
+    attachment_id = attachment_id.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+    url = f"{settings.AZURE_DEVOPS_BASE_URL}/attachments/{attachment_id}?download=true&api-version={settings.AZURE_DEVOPS_API_VERSION}"
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+
+    try:
+        file_path = resolve_attachment_path(file_path)
+        if os.path.exists(file_path) and not overwrite:
+            raise FileExistsError(f"The file {file_path} already exists")
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        return await download_file(
+            url, file_path, settings.ATTACHMENT_CHUNK_SIZE, credentials=credentials
+        )
+    except Exception as e:
+        logger.error(
+            "download_attachment_failed",
+            extra={"fields": {"attachment_id": attachment_id, "error": str(e)}},
+        )
+        return None
+
+
+async def get_workitem_comments(workitem_id: str, since_comment_id: int = 0) -> dict:
+    """
+    Get the comments of a workitem, downloading only the comments newer than the cached ones
+
+    The comments are cached per workitem up to the latest comment ID, so edits
+    to comments that are already cached are not downloaded again.
+
+    Args:
+        workitem_id: The ID of the workitem
+        since_comment_id: Only return the comments with a greater ID (e.g. 12)
+
+    Returns:
+        A dictionary with the keys "comments" (sorted from the oldest to the newest,
+        only the cached ones if the download failed) and "error" (None if it succeeded)
+    """
+    cached_comments = comments_cache.get(workitem_id) or []
+    latest_comment_id = cached_comments[-1]["id"] if cached_comments else 0
+
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+    new_comments = []
+    continuation_token = None
+    error = None
+    try:
+        while True:
+            url = f"{settings.AZURE_DEVOPS_BASE_URL}/workItems/{workitem_id}/comments?$top={settings.COMMENTS_PAGE_SIZE}&order=desc&api-version={settings.AZURE_DEVOPS_COMMENTS_API_VERSION}"
+            if continuation_token:
+                url += f"&continuationToken={quote(continuation_token)}"
+
+            response = await make_get_request(url, credentials=credentials)
+            page = response.get("comments", [])
+            new_comments.extend(
+                comment for comment in page if comment["id"] > latest_comment_id
+            )
+
+            continuation_token = response.get("continuationToken")
+            reached_cached = any(comment["id"] <= latest_comment_id for comment in page)
+            if not continuation_token or not page or reached_cached:
+                break
+    except Exception as e:
+        logger.error(
+            "get_workitem_comments_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
+        new_comments = []
+        error = str(e)
+
+    comments = cached_comments + sorted(new_comments, key=lambda c: c["id"])
+    if error is None:
+        comments_cache.set(workitem_id, comments)
+
+    return {
+        "comments": [
+            comment for comment in comments if comment["id"] > since_comment_id
+        ],
+        "error": error,
+    }
+
+
+async def get_workitems_comments(
+    workitems_ids: str, since_comment_id: int = 0
+) -> dict[str, dict]:
+    """
+    Get the comments of a list of workitems concurrently
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        since_comment_id: Only return the comments with a greater ID (e.g. 12)
+
+    Returns:
+        A dictionary with the comments and the error of each workitem ID (see get_workitem_comments)
+    """
+    workitems_ids_list = [
+        workitem_id.strip() for workitem_id in workitems_ids.split(",")
+    ]
+    comments = await scheduler.gather(
+        *(
+            get_workitem_comments(workitem_id, since_comment_id)
+            for workitem_id in workitems_ids_list
+        )
+    )
+
+    return dict(zip(workitems_ids_list, comments))
+
+
+async def get_workitem_updates(
+    workitem_id: str, since_date: str = "", since_rev: int = 0
+) -> dict:
+    """
+    Get the field changes of a workitem, downloading only the updates newer than the cached ones
+
+    Args:
+        workitem_id: The ID of the workitem
+        since_date: Only return the changes made on or after this date (e.g. "2025-07-02" or "2025-07-02T15:00:00Z")
+        since_rev: Only return the changes of a greater revision (e.g. 10)
+
+    Returns:
+        A dictionary with the keys "updates" and "error" (None if the download succeeded).
+        The updates are sorted from the oldest to the newest (only the ones downloaded
+        before an error), each one with the keys "rev", "changed_by", "changed_date"
+        and "fields" (reference name -> (old value, new value))
+    """
+    updates = list(updates_cache.get(workitem_id) or [])
+
+    credentials = ("", settings.AZURE_DEVOPS_ACCESS_TOKEN)
+    error = None
+    try:
+        while True:
+            url = f"{settings.AZURE_DEVOPS_BASE_URL}/workItems/{workitem_id}/updates?$top={settings.UPDATES_PAGE_SIZE}&$skip={len(updates)}&api-version={settings.AZURE_DEVOPS_API_VERSION}"
+            response = await make_get_request(url, credentials=credentials)
+            page = response.get("value", [])
+            updates.extend(build_workitem_update_diff(update) for update in page)
+
+            if len(page) < settings.UPDATES_PAGE_SIZE:
+                break
+    except Exception as e:
+        logger.error(
+            "get_workitem_updates_failed",
+            extra={"fields": {"workitem_id": workitem_id, "error": str(e)}},
+        )
+        error = str(e)
+
+    updates_cache.set(workitem_id, updates)
+
+    return {
+        "updates": [
+            update
+            for update in updates
+            if update["fields"]
+            and update["rev"] > since_rev
+            and update["changed_date"] >= since_date
+        ],
+        "error": error,
+    }
+
+
+async def get_workitems_updates(
+    workitems_ids: str, since_date: str = "", since_rev: int = 0
+) -> dict[str, dict]:
+    """
+    Get the field changes of a list of workitems concurrently
+
+    Args:
+        workitems_ids: A string of workitem IDs (comma separated) (e.g. "1,2,3")
+        since_date: Only return the changes made on or after this date (e.g. "2025-07-02")
+        since_rev: Only return the changes of a greater revision (e.g. 10)
+
+    Returns:
+        A dictionary with the changes and the error of each workitem ID (see get_workitem_updates)
+    """
+    workitems_ids_list = [
+        workitem_id.strip() for workitem_id in workitems_ids.split(",")
+    ]
+    updates = await scheduler.gather(
+        *(
+            get_workitem_updates(workitem_id, since_date, since_rev)
+            for workitem_id in workitems_ids_list
+        )
+    )
+
+    return dict(zip(workitems_ids_list, updates))
+
+
+def build_workitem_update_diff(update: dict) -> dict:
+    """
+    Build a compact diff from a workitem update
+
+    Args:
+        update: A workitem update as returned by the API
+
+    Returns:
+        The compact diff of the update
+    """
+    fields = update.get("fields") or {}
+
+    def get_value(value):
+        return value.get("displayName", value) if isinstance(value, dict) else value
+
+    return {
+        "rev": update.get("rev", 0),
+        "changed_by": get_value(update.get("revisedBy", {})),
+        "changed_date": fields.get("System.ChangedDate", {}).get("newValue", ""),
+        "fields": {
+            reference_name: (
+                get_value(change.get("oldValue")),
+                get_value(change.get("newValue")),
+            )
+            for reference_name, change in fields.items()
+            if reference_name not in IGNORED_UPDATE_FIELDS
+        },
+    }
+
+
+async def refresh_search_index() -> int:
+    """
+    Index the workitems assigned to the user that changed since the last refresh
+
+    The first refresh (and every SEARCH_INDEX_FULL_REFRESH_SECONDS) indexes all the
+    workitems assigned to the user and drops the ones that are no longer assigned.
+
+    Returns:
+        The number of workitems indexed
+    """
+    global search_index_refreshed_at, search_index_full_refreshed_at
+    global search_index_built
+
+    now = time.monotonic()
+    # Without a changed date (e.g. no workitems assigned) there is nothing to refresh from
+    full_refresh = (
+        not search_index.last_changed_date
+        or now - search_index_full_refreshed_at
+        > settings.SEARCH_INDEX_FULL_REFRESH_SECONDS
+    )
+    if full_refresh:
+        # The workitems are sorted from the most recently changed, so the ones that
+        # would be evicted from the index are not downloaded
+        workitems_ids = (await get_workitems_ids_assigned_to_user())[
+            : settings.SEARCH_INDEX_MAX_DOCUMENTS
+        ]
+    else:
+        # WIQL compares dates by day, so the workitems changed that day are indexed again
+        changed_date = search_index.last_changed_date.split("T")[0]
+        workitems_ids = await get_workitems_ids_assigned_to_user_by(
+            f"[System.ChangedDate] >= '{changed_date}'"
+        )
+
+    workitems_details = await get_workitems_in_chunks(
+        workitems_ids,
+        f"fields={','.join(SEARCH_INDEX_FIELDS)}",
+        priority=Priority.BULK,
+    )
+
+    if full_refresh:
+        for workitem_id in set(search_index.documents) - set(workitems_ids):
+            search_index.remove_workitem(workitem_id)
+        search_index_full_refreshed_at = now
+    for workitem in workitems_details:
+        search_index.add_workitem(workitem)
+    search_index_refreshed_at = now
+    search_index_built = True
+
+    logger.info(
+        "search_index_refreshed",
+        extra={
+            "fields": {
+                "full_refresh": full_refresh,
+                "indexed": len(workitems_details),
+                "documents": len(search_index.documents),
+                "terms": len(search_index.postings),
+            }
+        },
+    )
+
+    return len(workitems_details)
+
+
+def log_search_index_refresh_error(task: asyncio.Task) -> None:
+    """
+    Log the error of a background refresh of the search index
+
+    Args:
+        task: The finished refresh task
+    """
+    if task.cancelled() or task.exception() is None:
+        return
+
+    logger.error(
+        "search_index_refresh_failed",
+        exc_info=task.exception(),
+        extra={"fields": {"documents": len(search_index.documents)}},
+    )
+
+
+async def search_workitems(query: str, limit: int = 10) -> list[dict]:
+    """
+    Search the workitems assigned to the user by the terms of their title, description and tags
+
+    The index is built on the first search and then refreshed in the background,
+    so the searches are answered from memory.
+
+    Args:
+        query: The terms to search (e.g. "login error")
+        limit: The maximum number of results (e.g. 10)
+
+    Returns:
+        A list of matches sorted from the best to the worst, each one with the keys
+        "id", "title", "workitem_type", "state" and "score"
+    """
+    global search_index_refresh_task
+
+    # Once built, an empty index (e.g. no workitems assigned) is only refreshed in the background
+    if not search_index_built:
+        await refresh_search_index()
+    elif (
+        time.monotonic() - search_index_refreshed_at
+        > settings.SEARCH_INDEX_REFRESH_SECONDS
+        and (search_index_refresh_task is None or search_index_refresh_task.done())
+    ):
+        search_index_refresh_task = asyncio.create_task(refresh_search_index())
+        search_index_refresh_task.add_done_callback(log_search_index_refresh_error)
+
+    return [
+        {
+            "id": workitem_id,
+            "title": search_index.documents[workitem_id]["title"],
+            "workitem_type": search_index.documents[workitem_id]["workitem_type"],
+            "state": search_index.documents[workitem_id]["state"],
+            "score": score,
+        }
+        for workitem_id, score in search_index.search(query, limit)
+    ]
+
+
+async def get_planning_calendar(from_date: str, to_date: str) -> list[dict]:
+    """
+    Get the workitems assigned to the user and their effort totals for each planned day of a date range
+
+    A range is loaded with one WIQL query plus chunked detail fetches and then
+    answered from the planning index, refreshed with the workitems changed since
+    the last refresh (and fully reloaded every PLANNING_INDEX_FULL_REFRESH_SECONDS).
+
+    Args:
+        from_date: The first planned date (e.g. "2025-07-01")
+        to_date: The last planned date (e.g. "2025-07-07")
+
+    Returns:
+        A list of days with workitems sorted by date, each one with the keys "day",
+        "workitems", "effort" and "real_effort"
+    """
+    global planning_index_refreshed_at, planning_index_full_refreshed_at
+
+    now = time.monotonic()
+    if (
+        now - planning_index_full_refreshed_at
+        > settings.PLANNING_INDEX_FULL_REFRESH_SECONDS
+    ):
+        planning_index.clear()
+        planning_index_full_refreshed_at = now
+    elif (
+        now - planning_index_refreshed_at > settings.PLANNING_INDEX_REFRESH_SECONDS
+        and not planning_index.last_changed_date
+    ):
+        # The loaded ranges had no workitems, so there is no changed date to
+        # refresh from and they are loaded again
+        planning_index.clear()
+
+    if not planning_index.covers(from_date, to_date):
+        workitems_ids = await get_workitems_ids_assigned_to_user_by_planned_date_range(
+            from_date, to_date
+        )
+        workitems_details = await get_workitems_in_chunks(
+            workitems_ids, f"fields={','.join(PLANNING_INDEX_FIELDS)}"
+        )
+        planning_index.load_range(from_date, to_date, workitems_details)
+        planning_index_refreshed_at = now
+    elif now - planning_index_refreshed_at > settings.PLANNING_INDEX_REFRESH_SECONDS:
+        # WIQL compares dates by day, so the workitems changed that day are loaded again
+        changed_date = planning_index.last_changed_date.split("T")[0]
+        workitems_ids = await get_workitems_ids_assigned_to_user_by(
+            f"[System.ChangedDate] >= '{changed_date}'"
+        )
+        for workitem in await get_workitems_in_chunks(
+            workitems_ids, f"fields={','.join(PLANNING_INDEX_FIELDS)}"
+        ):
+            planning_index.add_workitem(workitem)
+        planning_index_refreshed_at = now
+
+    return planning_index.get_calendar(from_date, to_date)
+
+
 def build_query_to_get_workitems_ids_assigned_to_user() -> str:
     """
     Build a query to get all workitems assigned to a user
@@ -394,3 +1486,19 @@ def build_query_to_get_workitems_ids_assigned_to_user_by_planned_date(
         A query to get all workitems assigned to a user by a planned date
     """
     return f"SELECT [System.Id] FROM WorkItems WHERE [System.AssignedTo] = @Me AND Custom.FechaInicioPlaneada = '{planned_date}' ORDER BY [System.Id] DESC"
+
+
+def build_query_to_get_workitems_ids_assigned_to_user_by_planned_date_range(
+    from_date: str, to_date: str
+) -> str:
+    """
+    Build a query to get all workitems assigned to a user planned between two dates
+
+    Args:
+        from_date: The first planned date (e.g. "2025-07-01")
+        to_date: The last planned date (e.g. "2025-07-07")
+
+    Returns:
+        A query to get all workitems assigned to a user planned between two dates
+    """
+    return f"SELECT [System.Id] FROM WorkItems WHERE [System.AssignedTo] = @Me AND Custom.FechaInicioPlaneada >= '{from_date}' AND Custom.FechaInicioPlaneada <= '{to_date}' ORDER BY [System.Id] DESC"
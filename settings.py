@@ -7,13 +7,69 @@ dotenv.load_dotenv()
 
 class Settings:
     AZURE_DEVOPS_API_VERSION = "7.0"
+    AZURE_DEVOPS_COMMENTS_API_VERSION = "7.0-preview.3"
     USER_AGENT = "workitems-devops-mcp/1.0"
 
     AZURE_DEVOPS_ACCESS_TOKEN = os.getenv("AZURE_DEVOPS_ACCESS_TOKEN")
     AZURE_DEVOPS_PROJECT = os.getenv("AZURE_DEVOPS_PROJECT")
     AZURE_DEVOPS_ORGANIZATION = os.getenv("AZURE_DEVOPS_ORGANIZATION")
 
-    AZURE_DEVOPS_BASE_URL = f"https://dev.azure.com/{AZURE_DEVOPS_ORGANIZATION}/{AZURE_DEVOPS_PROJECT}/_apis/wit"
+    AZURE_DEVOPS_ORGANIZATION_URL = f"https://dev.azure.com/{AZURE_DEVOPS_ORGANIZATION}"
+    AZURE_DEVOPS_BASE_URL = (
+        f"{AZURE_DEVOPS_ORGANIZATION_URL}/{AZURE_DEVOPS_PROJECT}/_apis/wit"
+    )
+
+    MAX_CONCURRENT_REQUESTS = int(
+        os.getenv("WORKITEMS_MCP_MAX_CONCURRENT_REQUESTS", "8")
+    )
+    MAX_CONCURRENT_REQUESTS_PER_ENDPOINT = int(
+        os.getenv("WORKITEMS_MCP_MAX_CONCURRENT_REQUESTS_PER_ENDPOINT", "4")
+    )
+
+    WORKITEMS_BATCH_SIZE = 200
+    WORKITEMS_CREATE_BATCH_SIZE = 200
+
+    ATTACHMENT_CHUNK_SIZE = 4 * 1024 * 1024
+    ATTACHMENT_MAX_CONCURRENT_CHUNKS = 4
+    # Only the files inside this directory can be uploaded or downloaded as attachments
+    ATTACHMENTS_DIR = os.getenv(
+        "WORKITEMS_MCP_ATTACHMENTS_DIR",
+        os.path.join(os.path.expanduser("~"), "workitems-attachments"),
+    )
+
+    HIERARCHY_MAX_DEPTH = 10
+    HIERARCHY_MAX_NODES = 500
+
+    ITEM_CACHE_MAX_ITEMS = int(os.getenv("WORKITEMS_MCP_ITEM_CACHE_MAX_ITEMS", "500"))
+    COMMENTS_PAGE_SIZE = 200
+    UPDATES_PAGE_SIZE = 200
+
+    SEARCH_INDEX_MAX_DOCUMENTS = int(
+        os.getenv("WORKITEMS_MCP_SEARCH_INDEX_MAX_DOCUMENTS", "5000")
+    )
+    SEARCH_INDEX_MAX_TERMS_PER_DOCUMENT = 500
+    SEARCH_INDEX_REFRESH_SECONDS = 60
+    SEARCH_INDEX_FULL_REFRESH_SECONDS = 3600
+
+    PLANNING_INDEX_REFRESH_SECONDS = 60
+    PLANNING_INDEX_FULL_REFRESH_SECONDS = 3600
+
+    RESULT_MAX_CHARS = int(os.getenv("WORKITEMS_MCP_RESULT_MAX_CHARS", "20000"))
+    RESULT_PAGE_SIZE = 20
+    RESULT_SUMMARY_MAX_ENTRIES = 50
+    RESULT_SUMMARY_LINE_MAX_CHARS = 200
+    RESULT_STORE_MAX_RESULTS = 50
+    RESULT_STORE_MAX_CHARS = 5_000_000
+    RESULT_STORE_TTL_SECONDS = 1800
+
+    LOG_LEVEL = os.getenv("WORKITEMS_MCP_LOG_LEVEL", "INFO").upper()
+    LOG_FILE = os.getenv("WORKITEMS_MCP_LOG_FILE")
+    LOG_SAMPLE_RATE = float(os.getenv("WORKITEMS_MCP_LOG_SAMPLE_RATE", "0.1"))
+
+    CACHE_DIR = os.getenv(
+        "WORKITEMS_MCP_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "workitems-devops-mcp"),
+    )
 
 
 settings = Settings()
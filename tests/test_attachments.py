@@ -0,0 +1,195 @@
+import asyncio
+import functools
+import os
+import tracemalloc
+
+import httpx
+import pytest
+
+from services import workitems
+from settings import settings
+
+CHUNK_SIZE = 64 * 1024
+CHUNKS_COUNT = 64
+MAX_CONCURRENT_CHUNKS = 2
+
+
+class StubAzureDevOps(httpx.AsyncBaseTransport):
+    """
+    Stub of the Azure DevOps attachments API served as an httpx transport
+
+    Unlike httpx.MockTransport it does not read the whole request body up front,
+    so the memory measured is the one of a real transport. It records the chunk
+    uploads running at once and serves downloads generated chunk by chunk, so the
+    memory held by the stub does not depend on the file size.
+    """
+
+    def __init__(self, keep_uploads: bool = False):
+        self.keep_uploads = keep_uploads
+        self.uploaded: dict[int, bytes] = {}
+        self.uploaded_bytes = 0
+        self.running_chunks = 0
+        self.max_running_chunks = 0
+        self.max_tasks = 0
+        self.download_content = b""
+        self.fail_offset: int | None = None
+        self.failed = False
+        self.puts_after_failure = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(
+                201, json={"id": "guid", "url": "https://stub/attachments/guid"}
+            )
+
+        if request.method == "PUT":
+            offset = int(request.headers["Content-Range"].split()[1].split("-")[0])
+            if self.failed:
+                self.puts_after_failure += 1
+            if offset == self.fail_offset:
+                self.failed = True
+                return httpx.Response(500, json={"message": "Chunk rejected"})
+
+            self.running_chunks += 1
+            self.max_tasks = max(self.max_tasks, len(asyncio.all_tasks()))
+            self.max_running_chunks = max(self.max_running_chunks, self.running_chunks)
+            await asyncio.sleep(0.001)
+            self.running_chunks -= 1
+
+            content = b"".join([part async for part in request.stream])
+            self.uploaded_bytes += len(content)
+            if self.keep_uploads:
+                self.uploaded[offset] = content
+            return httpx.Response(201, json={"id": "guid"})
+
+        if request.method == "GET" and "download=true" in str(request.url):
+            return httpx.Response(200, content=self.stream_download())
+
+        return httpx.Response(404)
+
+    async def stream_download(self):
+        if self.download_content:
+            yield self.download_content
+            return
+
+        chunk = b"x" * CHUNK_SIZE
+        for _ in range(CHUNKS_COUNT):
+            yield chunk
+
+
+@pytest.fixture
+def stub(monkeypatch, tmp_path):
+    stub = StubAzureDevOps()
+    monkeypatch.setattr(
+        httpx, "AsyncClient", functools.partial(httpx.AsyncClient, transport=stub)
+    )
+    monkeypatch.setattr(settings, "AZURE_DEVOPS_ACCESS_TOKEN", "token")
+    monkeypatch.setattr(settings, "ATTACHMENT_CHUNK_SIZE", CHUNK_SIZE)
+    monkeypatch.setattr(
+        settings, "ATTACHMENT_MAX_CONCURRENT_CHUNKS", MAX_CONCURRENT_CHUNKS
+    )
+    monkeypatch.setattr(settings, "ATTACHMENTS_DIR", str(tmp_path))
+
+    return stub
+
+
+def write_file(path, chunks_count: int = CHUNKS_COUNT) -> None:
+    with open(path, "wb") as file:
+        for index in range(chunks_count):
+            file.write(bytes([index % 256]) * CHUNK_SIZE)
+
+
+def test_upload_limits_concurrent_chunks_and_memory(stub, tmp_path):
+    write_file(tmp_path / "big.bin")
+
+    tracemalloc.start()
+    try:
+        asyncio.run(workitems.upload_attachment("big.bin"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert stub.uploaded_bytes == CHUNK_SIZE * CHUNKS_COUNT
+    assert 1 < stub.max_running_chunks <= MAX_CONCURRENT_CHUNKS
+    # The upload itself and its workers, whatever the number of chunks
+    assert stub.max_tasks <= MAX_CONCURRENT_CHUNKS + 1
+    # The file is 4 MiB, only a few chunks may be held in memory at once
+    assert peak < CHUNK_SIZE * CHUNKS_COUNT / 4
+
+
+def test_download_streams_to_disk(stub, tmp_path):
+    tracemalloc.start()
+    try:
+        written = asyncio.run(workitems.download_attachment("guid", "big.bin"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert written == CHUNK_SIZE * CHUNKS_COUNT
+    assert os.path.getsize(tmp_path / "big.bin") == written
+    assert not os.path.exists(tmp_path / "big.bin.part")
+    assert peak < CHUNK_SIZE * CHUNKS_COUNT / 4
+
+
+def test_upload_stops_at_the_first_failed_chunk(stub, tmp_path):
+    write_file(tmp_path / "big.bin")
+    stub.fail_offset = 3 * CHUNK_SIZE
+
+    assert not asyncio.run(workitems.add_workitem_attachment("1", "big.bin"))
+    assert stub.failed
+    assert stub.puts_after_failure == 0
+    assert stub.uploaded_bytes < 3 * CHUNK_SIZE + MAX_CONCURRENT_CHUNKS * CHUNK_SIZE
+
+
+def test_upload_and_download_round_trip(stub, tmp_path):
+    stub.keep_uploads = True
+    write_file(tmp_path / "small.bin", chunks_count=5)
+
+    asyncio.run(workitems.upload_attachment("small.bin"))
+    stub.download_content = b"".join(
+        stub.uploaded[offset] for offset in sorted(stub.uploaded)
+    )
+    written = asyncio.run(
+        workitems.download_attachment(
+            "https://stub/_apis/wit/attachments/guid?fileName=small.bin", "copy.bin"
+        )
+    )
+
+    assert written == 5 * CHUNK_SIZE
+    assert (tmp_path / "copy.bin").read_bytes() == (tmp_path / "small.bin").read_bytes()
+
+
+def test_attachment_paths_outside_the_attachments_directory_are_rejected(
+    stub, tmp_path
+):
+    outside = tmp_path.parent / "outside.bin"
+    write_file(outside, chunks_count=1)
+    os.symlink(outside, tmp_path / "link.bin")
+
+    for file_path in [str(outside), "../outside.bin", "link.bin"]:
+        with pytest.raises(ValueError):
+            asyncio.run(workitems.upload_attachment(file_path))
+        assert asyncio.run(workitems.download_attachment("guid", file_path)) is None
+
+    assert outside.read_bytes() == b"\x00" * CHUNK_SIZE
+    assert stub.uploaded_bytes == 0
+
+
+def test_download_does_not_overwrite_existing_files(stub, tmp_path):
+    (tmp_path / "existing.bin").write_bytes(b"keep")
+
+    assert asyncio.run(workitems.download_attachment("guid", "existing.bin")) is None
+    assert (tmp_path / "existing.bin").read_bytes() == b"keep"
+
+    written = asyncio.run(
+        workitems.download_attachment("guid", "existing.bin", overwrite=True)
+    )
+    assert written == CHUNK_SIZE * CHUNKS_COUNT
+
+
+def test_download_fails_when_the_temporary_file_cannot_be_opened(stub, tmp_path):
+    (tmp_path / "file.bin.part").mkdir()
+
+    assert asyncio.run(workitems.download_attachment("guid", "file.bin")) is None
+    assert (tmp_path / "file.bin.part").is_dir()
+    assert not (tmp_path / "file.bin").exists()
@@ -22,6 +22,53 @@ def format_workitem(workitem: dict) -> str:
     )
 
 
+def format_workitem_comment(comment: dict) -> str:
+    created_by = comment.get("createdBy", {}).get("displayName")
+    modified = (
+        f" (editado el {comment.get('modifiedDate')})"
+        if comment.get("version", 1) > 1
+        else ""
+    )
+
+    return (
+        f"Comentario {comment.get('id')} por {created_by} el {comment.get('createdDate')}{modified}:\n"
+        f"{comment.get('text', '')}"
+    )
+
+
+def format_workitem_tree(node: dict, depth: int = 0) -> str:
+    fields = node.get("workitem", {}).get("fields", {})
+
+    line = (
+        f"{'    ' * depth}[{fields.get('System.WorkItemType')}] {node.get('workitem', {}).get('id')} "
+        f"- {fields.get('System.Title')} ({fields.get('System.State')}) | "
+        f"Esfuerzo: {format_effort(node.get('effort', 0))} | "
+        f"Esfuerzo real: {format_effort(node.get('real_effort', 0))}"
+    )
+    if node.get("children"):
+        line += (
+            f" | Esfuerzo hijos: {format_effort(node.get('children_effort', 0))} | "
+            f"Esfuerzo real hijos: {format_effort(node.get('children_real_effort', 0))}"
+        )
+
+    return "\n".join(
+        [line]
+        + [format_workitem_tree(child, depth + 1) for child in node.get("children", [])]
+    )
+
+
+def format_workitem_update(update: dict) -> str:
+    changes = "\n".join(
+        f"  {reference_name}: {old_value} -> {new_value}"
+        for reference_name, (old_value, new_value) in update.get("fields", {}).items()
+    )
+
+    return (
+        f"Revisión {update.get('rev')} por {update.get('changed_by')} el {update.get('changed_date')}:\n"
+        f"{changes}"
+    )
+
+
 def format_workitem_type(workitem_type: dict) -> str:
     name = workitem_type.get("name", "")
     ref_name = workitem_type.get("referenceName", "")
@@ -77,6 +124,10 @@ def format_workitem_type_transition(from_state: str, to_state: str) -> str:
     return f"De: {from_state} -> A: {to_state}"
 
 
+def format_workitem_transition_path(path: list[str], categories: dict[str, str]) -> str:
+    return " -> ".join(f"{state} ({categories.get(state, '')})" for state in path)
+
+
 def format_workitem_type_state(workitem_type_state: dict) -> str:
     name = workitem_type_state.get("name", "")
     category = workitem_type_state.get("category", "")
@@ -85,6 +136,38 @@ def format_workitem_type_state(workitem_type_state: dict) -> str:
     return f"Estado: {name}\nCategoría: {category}\nColor: #{color}\n"
 
 
+def format_planning_day(planning_day: dict) -> str:
+    workitems = "\n".join(
+        f"  {workitem['id']} - [{workitem['workitem_type']}] {workitem['title']} ({workitem['state']}) | "
+        f"Esfuerzo: {format_effort(workitem['effort'])} | Esfuerzo real: {format_effort(workitem['real_effort'])}"
+        for workitem in planning_day.get("workitems", [])
+    )
+
+    return (
+        f"{planning_day.get('day')} | Esfuerzo: {format_effort(planning_day.get('effort', 0))} | "
+        f"Esfuerzo real: {format_effort(planning_day.get('real_effort', 0))}\n"
+        f"{workitems}"
+    )
+
+
+def format_scheduler_metrics(metrics: dict) -> str:
+    queued_by_priority = ", ".join(
+        f"{priority}: {count}"
+        for priority, count in metrics.get("queued_by_priority", {}).items()
+    )
+    running_by_endpoint = "\n".join(
+        f"{endpoint}: {count}"
+        for endpoint, count in metrics.get("running_by_endpoint", {}).items()
+    )
+
+    return (
+        f"En ejecución: {metrics.get('running')} (máximo {metrics.get('max_concurrency')})\n"
+        f"En cola: {metrics.get('queued')} ({queued_by_priority})\n"
+        f"Máximo por endpoint: {metrics.get('max_concurrency_per_endpoint')}\n\n"
+        f"En ejecución por endpoint:\n{running_by_endpoint or 'Ninguno'}"
+    )
+
+
 def format_date_from_iso(date: str) -> str:
     """
     Format a date from ISO format to YYYY-MM-DD
@@ -1,6 +1,37 @@
+import asyncio
+import os
+import time
+
 import httpx
 
 from settings import settings
+from utils.logger import get_logger, log_sampled
+from utils.scheduler import get_endpoint, scheduler
+
+logger = get_logger(__name__)
+
+
+def log_response(method: str, url: str, response: httpx.Response, start: float) -> None:
+    """
+    Log the result and duration of a request to the Azure DevOps API
+
+    Args:
+        method: The HTTP method used
+        url: The URL of the request
+        response: The response of the request
+        start: The value of time.perf_counter() when the request started
+    """
+    fields = {
+        "method": method,
+        "url": url,
+        "status_code": response.status_code,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+    if response.is_error:
+        logger.warning("http_request_failed", extra={"fields": fields})
+    else:
+        log_sampled(logger, "http_request", settings.LOG_SAMPLE_RATE, **fields)
 
 
 async def make_get_request(
@@ -24,8 +55,13 @@ async def make_get_request(
         "Accept": "application/json",
     }
 
-    async with httpx.AsyncClient(headers=headers) as client:
+    async with (
+        scheduler.slot(get_endpoint("GET", url)),
+        httpx.AsyncClient(headers=headers) as client,
+    ):
+        start = time.perf_counter()
         response = await client.get(url, auth=credentials)
+        log_response("GET", url, response, start)
         response.raise_for_status()
 
         return response.json()
@@ -34,7 +70,7 @@ async def make_get_request(
 async def make_post_request(
     url: str,
     method: str,
-    data: dict = {},
+    data: dict | list[dict] = {},
     credentials: tuple = (),
 ) -> dict:
     """
@@ -57,8 +93,13 @@ async def make_post_request(
         "Accept": "application/json",
     }
 
-    async with httpx.AsyncClient(headers=headers) as client:
+    async with (
+        scheduler.slot(get_endpoint("POST", url)),
+        httpx.AsyncClient(headers=headers) as client,
+    ):
+        start = time.perf_counter()
         response = await client.post(url, json=data, auth=credentials)
+        log_response("POST", url, response, start)
         response.raise_for_status()
 
         return response.json()
@@ -79,8 +120,121 @@ async def make_patch_request(
         "Accept": "application/json",
     }
 
-    async with httpx.AsyncClient(headers=headers) as client:
+    async with (
+        scheduler.slot(get_endpoint("PATCH", url)),
+        httpx.AsyncClient(headers=headers) as client,
+    ):
+        start = time.perf_counter()
         response = await client.patch(url, json=data, auth=credentials)
+        log_response("PATCH", url, response, start)
+        response.raise_for_status()
+
+        return response.json()
+
+
+async def iter_content(content: bytes):
+    """
+    Yield the body of a request once, so it is released when it was sent
+
+    Args:
+        content: The bytes to send
+    """
+    yield content
+
+
+async def make_binary_request(
+    url: str,
+    method: str,
+    content: bytes = b"",
+    headers: dict | None = None,
+    credentials: tuple = (),
+) -> dict:
+    """
+    Make a request with a binary body (e.g. an attachment chunk) to the Azure DevOps API
+
+    Args:
+        url: The URL to make the request to
+        method: The HTTP method to use (e.g. "POST", "PUT")
+        content: The bytes to send with the request
+        headers: The extra headers to send with the request (e.g. "Content-Range")
+        credentials: The credentials to use for the request
+
+    Returns:
+        The response from the request
+    """
+
+    request_headers = {
+        "User-Agent": settings.USER_AGENT,
+        "Content-Type": "application/octet-stream",
+        "Accept": "application/json",
+        "Content-Length": str(len(content)),
+        **(headers or {}),
+    }
+
+    async with (
+        scheduler.slot(get_endpoint(method, url)),
+        httpx.AsyncClient(headers=request_headers) as client,
+    ):
+        start = time.perf_counter()
+        # Sent as a stream so the request does not keep a copy of the body, which
+        # httpx holds in a reference cycle until the garbage collector runs
+        response = await client.request(
+            method, url, content=iter_content(content), auth=credentials
+        )
+        log_response(method, url, response, start)
         response.raise_for_status()
 
         return response.json()
+
+
+async def download_file(
+    url: str,
+    file_path: str,
+    chunk_size: int,
+    credentials: tuple = (),
+) -> int:
+    """
+    Stream a file from the Azure DevOps API to disk without buffering it in memory
+
+    The file is written to a temporary file next to the destination and renamed when complete.
+
+    Args:
+        url: The URL to download
+        file_path: The path where the file is saved
+        chunk_size: The maximum number of bytes held in memory at once
+        credentials: The credentials to use for the request
+
+    Returns:
+        The number of bytes written
+    """
+
+    headers = {
+        "User-Agent": settings.USER_AGENT,
+        "Accept": "application/octet-stream",
+    }
+
+    temp_path = f"{file_path}.part"
+    written = 0
+    start = time.perf_counter()
+    async with (
+        scheduler.slot(get_endpoint("GET", url)),
+        httpx.AsyncClient(headers=headers) as client,
+        client.stream("GET", url, auth=credentials) as response,
+    ):
+        log_response("GET", url, response, start)
+        response.raise_for_status()
+
+        # Opened outside the try, so a failed open does not try to remove a missing file
+        file = open(temp_path, "wb")
+        try:
+            with file:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    await asyncio.to_thread(file.write, chunk)
+                    written += len(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    os.replace(temp_path, file_path)
+
+    return written
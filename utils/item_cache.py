@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+
+class ItemCache:
+    """
+    Bounded in-memory cache of per-workitem lists (e.g. comments or updates)
+
+    The least recently used workitems are evicted when the cache is full.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: OrderedDict[str, list[dict]] = OrderedDict()
+
+    def get(self, workitem_id: str) -> list[dict] | None:
+        """
+        Get the cached list of a workitem
+
+        Args:
+            workitem_id: The ID of the workitem
+
+        Returns:
+            The cached list or None if the workitem is not cached
+        """
+        items = self._items.get(workitem_id)
+        if items is not None:
+            self._items.move_to_end(workitem_id)
+
+        return items
+
+    def set(self, workitem_id: str, items: list[dict]) -> None:
+        """
+        Store the list of a workitem
+
+        Args:
+            workitem_id: The ID of the workitem
+            items: The list to store
+        """
+        self._items[workitem_id] = items
+        self._items.move_to_end(workitem_id)
+
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
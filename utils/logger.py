@@ -0,0 +1,176 @@
+import atexit
+import contextvars
+import copy
+import functools
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from settings import settings
+
+request_id_var: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "request_id", default=None
+)
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as JSON lines with the request correlation ID and the structured fields
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update(getattr(record, "fields", {}))
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class JsonQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue log records keeping the exception text out of the event
+
+    The default QueueHandler appends the traceback to the message, so the
+    exception is formatted here into exc_text and written in its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+
+        return record
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Attach the current request correlation ID to the log records
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+def _setup_logging() -> None:
+    global _listener
+
+    if settings.LOG_FILE:
+        handler = logging.FileHandler(settings.LOG_FILE, encoding="utf-8")
+    else:
+        # stdout is reserved for the MCP stdio transport
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = JsonQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    root_logger = logging.getLogger("workitems")
+    root_logger.setLevel(settings.LOG_LEVEL)
+    root_logger.addHandler(queue_handler)
+    root_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a structured logger that writes JSON lines from a background thread
+
+    Args:
+        name: The name of the logger (e.g. "services.workitems")
+
+    Returns:
+        The logger
+    """
+    if _listener is None:
+        _setup_logging()
+
+    return logging.getLogger(f"workitems.{name}")
+
+
+def log_sampled(
+    logger: logging.Logger, event: str, sample_rate: float, **fields
+) -> None:
+    """
+    Log a high volume event at DEBUG level only for a fraction of the calls
+
+    Args:
+        logger: The logger to use
+        event: The name of the event (e.g. "http_request")
+        sample_rate: The fraction of the events to log (e.g. 0.1)
+        fields: The structured fields of the event
+    """
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < sample_rate:
+        logger.debug(event, extra={"fields": {**fields, "sample_rate": sample_rate}})
+
+
+def with_request_id(function):
+    """
+    Run a coroutine function with a new request correlation ID and log its duration
+
+    Args:
+        function: The coroutine function to wrap (e.g. an MCP tool)
+
+    Returns:
+        The wrapped coroutine function
+    """
+    logger = get_logger("tools")
+
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        token = request_id_var.set(uuid.uuid4().hex[:12])
+        start = time.perf_counter()
+        try:
+            result = await function(*args, **kwargs)
+            logger.info(
+                "tool_call",
+                extra={
+                    "fields": {
+                        "tool": function.__name__,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    }
+                },
+            )
+            return result
+        except Exception:
+            logger.exception(
+                "tool_call_failed",
+                extra={
+                    "fields": {
+                        "tool": function.__name__,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    }
+                },
+            )
+            raise
+        finally:
+            request_id_var.reset(token)
+
+    return wrapper
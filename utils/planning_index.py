@@ -0,0 +1,133 @@
+class PlanningIndex:
+    """
+    In-memory index of the workitems bucketed by planned start day (Custom.FechaInicioPlaneada)
+
+    The index remembers the date ranges it was loaded for, so a range inside a
+    loaded one is answered without querying Azure DevOps.
+    """
+
+    def __init__(self):
+        self.days: dict[str, dict[str, dict]] = {}
+        self.workitems_days: dict[str, str] = {}
+        self.ranges: list[tuple[str, str]] = []
+        self.last_changed_date = ""
+
+    def covers(self, from_date: str, to_date: str) -> bool:
+        """
+        Check if a date range was loaded in the index
+
+        Args:
+            from_date: The first day of the range (e.g. "2025-07-01")
+            to_date: The last day of the range (e.g. "2025-07-07")
+
+        Returns:
+            True if the range is inside a loaded range
+        """
+        return any(
+            range_from <= from_date and to_date <= range_to
+            for range_from, range_to in self.ranges
+        )
+
+    def load_range(self, from_date: str, to_date: str, workitems: list[dict]) -> None:
+        """
+        Replace the workitems planned in a date range
+
+        Args:
+            from_date: The first day of the range (e.g. "2025-07-01")
+            to_date: The last day of the range (e.g. "2025-07-07")
+            workitems: All the workitems planned in the range
+        """
+        for workitem_id, day in list(self.workitems_days.items()):
+            if from_date <= day <= to_date:
+                self.remove_workitem(workitem_id)
+
+        self.ranges.append((from_date, to_date))
+        for workitem in workitems:
+            self.add_workitem(workitem)
+
+    def add_workitem(self, workitem: dict) -> None:
+        """
+        Add a workitem to the day of its planned start, or remove it if it is no longer planned in a loaded range
+
+        Args:
+            workitem: A workitem with its planning fields
+        """
+        workitem_id = str(workitem["id"])
+        fields = workitem.get("fields", {})
+        self.remove_workitem(workitem_id)
+        self.last_changed_date = max(
+            self.last_changed_date, fields.get("System.ChangedDate", "")
+        )
+
+        planned_date = fields.get("Custom.FechaInicioPlaneada")
+        if not planned_date:
+            return
+
+        day = planned_date.split("T")[0]
+        if not self.covers(day, day):
+            return
+
+        self.days.setdefault(day, {})[workitem_id] = {
+            "id": workitem_id,
+            "title": fields.get("System.Title", ""),
+            "workitem_type": fields.get("System.WorkItemType", ""),
+            "state": fields.get("System.State", ""),
+            "effort": float(fields.get("Microsoft.VSTS.Scheduling.Effort") or 0),
+            "real_effort": float(fields.get("Custom.RealEffort") or 0),
+        }
+        self.workitems_days[workitem_id] = day
+
+    def remove_workitem(self, workitem_id: str) -> None:
+        """
+        Remove a workitem from the index
+
+        Args:
+            workitem_id: The ID of the workitem
+        """
+        day = self.workitems_days.pop(workitem_id, None)
+        if day is None:
+            return
+
+        del self.days[day][workitem_id]
+        if not self.days[day]:
+            del self.days[day]
+
+    def clear(self) -> None:
+        """
+        Remove all the workitems and loaded ranges
+        """
+        self.days.clear()
+        self.workitems_days.clear()
+        self.ranges.clear()
+        self.last_changed_date = ""
+
+    def get_calendar(self, from_date: str, to_date: str) -> list[dict]:
+        """
+        Get the workitems and effort totals of each day of a date range
+
+        Args:
+            from_date: The first day of the range (e.g. "2025-07-01")
+            to_date: The last day of the range (e.g. "2025-07-07")
+
+        Returns:
+            A list of days sorted by date, each one with the keys "day", "workitems",
+            "effort" and "real_effort"
+        """
+        calendar = []
+        for day in sorted(self.days):
+            if not from_date <= day <= to_date:
+                continue
+
+            workitems = list(self.days[day].values())
+            calendar.append(
+                {
+                    "day": day,
+                    "workitems": workitems,
+                    "effort": sum(workitem["effort"] for workitem in workitems),
+                    "real_effort": sum(
+                        workitem["real_effort"] for workitem in workitems
+                    ),
+                }
+            )
+
+        return calendar
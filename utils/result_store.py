@@ -0,0 +1,117 @@
+import time
+import uuid
+from collections import OrderedDict
+
+from settings import settings
+
+
+class ResultStore:
+    """
+    Bounded in-memory store of large tool results, read back page by page
+
+    Results expire after a time to live and the least recently used ones are
+    evicted when the store has too many results or too many characters (the
+    last stored result is always kept).
+    """
+
+    def __init__(
+        self, max_results: int, max_chars: int, ttl_seconds: int, page_size: int
+    ):
+        self.max_results = max_results
+        self.max_chars = max_chars
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.total_chars = 0
+        self._results: OrderedDict[str, dict] = OrderedDict()
+
+    def _remove(self, handle: str) -> None:
+        self.total_chars -= self._results.pop(handle)["chars"]
+
+    def _remove_expired(self) -> None:
+        now = time.monotonic()
+        for handle in [
+            handle
+            for handle, result in self._results.items()
+            if result["expires_at"] <= now
+        ]:
+            self._remove(handle)
+
+    def put(self, title: str, entries: list[str], separator: str = "\n\n") -> str:
+        """
+        Store a result
+
+        Args:
+            title: The title of the result (e.g. "Workitems details")
+            entries: The formatted entries of the result (e.g. one per workitem)
+            separator: The text between the entries of a page
+
+        Returns:
+            The handle of the result
+        """
+        self._remove_expired()
+
+        handle = uuid.uuid4().hex[:12]
+        chars = sum(len(entry) for entry in entries)
+        self._results[handle] = {
+            "title": title,
+            "entries": entries,
+            "separator": separator,
+            "chars": chars,
+            "expires_at": time.monotonic() + self.ttl_seconds,
+        }
+        self.total_chars += chars
+
+        while len(self._results) > 1 and (
+            len(self._results) > self.max_results or self.total_chars > self.max_chars
+        ):
+            self._remove(next(iter(self._results)))
+
+        return handle
+
+    def get_pages_count(self, handle: str) -> int:
+        """
+        Get the number of pages of a result
+
+        Args:
+            handle: The handle of the result
+
+        Returns:
+            The number of pages or 0 if the result does not exist or expired
+        """
+        self._remove_expired()
+        result = self._results.get(handle)
+        if result is None:
+            return 0
+
+        return max(1, -(-len(result["entries"]) // self.page_size))
+
+    def get_page(self, handle: str, page: int) -> str | None:
+        """
+        Get a page of a result
+
+        Args:
+            handle: The handle of the result
+            page: The number of the page, starting at 1
+
+        Returns:
+            The entries of the page joined by the separator of the result, or None
+            if the result or the page does not exist
+        """
+        if not 1 <= page <= self.get_pages_count(handle):
+            return None
+
+        self._results.move_to_end(handle)
+        result = self._results[handle]
+        start = (page - 1) * self.page_size
+
+        return result["separator"].join(
+            result["entries"][start : start + self.page_size]
+        )
+
+
+result_store = ResultStore(
+    settings.RESULT_STORE_MAX_RESULTS,
+    settings.RESULT_STORE_MAX_CHARS,
+    settings.RESULT_STORE_TTL_SECONDS,
+    settings.RESULT_PAGE_SIZE,
+)
@@ -0,0 +1,199 @@
+import asyncio
+import contextvars
+import itertools
+from collections.abc import Coroutine
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+from settings import settings
+
+
+class Priority(IntEnum):
+    """
+    Priority classes of the scheduled requests (lower values run first)
+    """
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+priority_var: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "priority", default=Priority.INTERACTIVE
+)
+
+
+class TaskScheduler:
+    """
+    Limit the concurrent requests to the Azure DevOps API globally and per endpoint
+
+    Waiting requests are granted by priority class and then in arrival order, so
+    interactive reads are not starved by bulk writes. A waiting request that is
+    cancelled (e.g. because the MCP request was cancelled) leaves the queue.
+    """
+
+    def __init__(self, max_concurrency: int, max_concurrency_per_endpoint: int):
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_per_endpoint = max_concurrency_per_endpoint
+        self._running = 0
+        self._running_by_endpoint: dict[str, int] = {}
+        self._waiters: list[tuple[Priority, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    def _can_run(self, endpoint: str) -> bool:
+        return (
+            self._running < self.max_concurrency
+            and self._running_by_endpoint.get(endpoint, 0)
+            < self.max_concurrency_per_endpoint
+        )
+
+    def _start(self, endpoint: str) -> None:
+        self._running += 1
+        self._running_by_endpoint[endpoint] = (
+            self._running_by_endpoint.get(endpoint, 0) + 1
+        )
+
+    def _wake_waiters(self) -> None:
+        self._waiters = [waiter for waiter in self._waiters if not waiter[3].done()]
+        self._waiters.sort(key=lambda waiter: (waiter[0], waiter[1]))
+
+        for waiter in list(self._waiters):
+            if self._running >= self.max_concurrency:
+                break
+
+            endpoint, future = waiter[2], waiter[3]
+            if self._can_run(endpoint):
+                self._waiters.remove(waiter)
+                self._start(endpoint)
+                future.set_result(None)
+
+    async def acquire(self, endpoint: str, priority: Priority) -> None:
+        """
+        Wait for a free slot for an endpoint
+
+        Args:
+            endpoint: The endpoint of the request (e.g. "GET workitems")
+            priority: The priority class of the request
+        """
+        has_queued_waiters = any(not waiter[3].done() for waiter in self._waiters)
+        if not has_queued_waiters and self._can_run(endpoint):
+            self._start(endpoint)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((priority, next(self._sequence), endpoint, future))
+        self._wake_waiters()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(endpoint)
+            raise
+
+    def release(self, endpoint: str) -> None:
+        """
+        Free the slot of an endpoint and grant it to the next waiting request
+
+        Args:
+            endpoint: The endpoint of the request (e.g. "GET workitems")
+        """
+        self._running -= 1
+        self._running_by_endpoint[endpoint] -= 1
+        if not self._running_by_endpoint[endpoint]:
+            del self._running_by_endpoint[endpoint]
+
+        self._wake_waiters()
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str, priority: Priority | None = None):
+        """
+        Hold a slot for an endpoint while the block runs
+
+        Args:
+            endpoint: The endpoint of the request (e.g. "GET workitems")
+            priority: The priority class of the request (defaults to the one of the current task)
+        """
+        await self.acquire(
+            endpoint, priority if priority is not None else priority_var.get()
+        )
+        try:
+            yield
+        finally:
+            self.release(endpoint)
+
+    def get_metrics(self) -> dict:
+        """
+        Get the queue depth and the running requests of the scheduler
+
+        Returns:
+            A dictionary with the running and queued requests
+        """
+        waiters = [waiter for waiter in self._waiters if not waiter[3].done()]
+
+        return {
+            "running": self._running,
+            "queued": len(waiters),
+            "queued_by_priority": {
+                priority.name: sum(1 for waiter in waiters if waiter[0] == priority)
+                for priority in Priority
+            },
+            "running_by_endpoint": dict(self._running_by_endpoint),
+            "max_concurrency": self.max_concurrency,
+            "max_concurrency_per_endpoint": self.max_concurrency_per_endpoint,
+        }
+
+
+scheduler = TaskScheduler(
+    settings.MAX_CONCURRENT_REQUESTS, settings.MAX_CONCURRENT_REQUESTS_PER_ENDPOINT
+)
+
+
+def get_endpoint(method: str, url: str) -> str:
+    """
+    Get the endpoint used to limit the concurrent requests of a URL
+
+    Args:
+        method: The HTTP method of the request
+        url: The URL of the request (e.g. ".../_apis/wit/workItems/1/comments?api-version=7.0")
+
+    Returns:
+        The endpoint of the request, lowercase and with the sub-resource if any
+        (e.g. "GET workitems/comments")
+    """
+    path = url.split("?", 1)[0]
+    resource = path.split("/_apis/", 1)[-1].lower().split("/")
+    if resource[0] == "wit" and len(resource) > 1:
+        resource = resource[1:]
+
+    # e.g. workitems/{id}/comments and workitems/{id}/updates are different endpoints
+    if len(resource) > 2 and resource[2]:
+        return f"{method} {resource[0]}/{resource[2]}"
+
+    return f"{method} {resource[0]}"
+
+
+async def gather(*coros: Coroutine, priority: Priority = Priority.BULK) -> list:
+    """
+    Run coroutines concurrently with the requests they make scheduled with a priority class
+
+    The first coroutine that fails cancels the others and its exception is raised,
+    and cancelling the caller cancels all of them, so their queued requests leave
+    the scheduler and no request keeps running after the call returned.
+
+    Args:
+        coros: The coroutines to run
+        priority: The priority class of the requests made by the coroutines
+
+    Returns:
+        The results of the coroutines in order
+    """
+    token = priority_var.set(priority)
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+    except BaseExceptionGroup as error:
+        raise error.exceptions[0] from None
+    finally:
+        priority_var.reset(token)
+
+    return [task.result() for task in tasks]
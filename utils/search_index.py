@@ -0,0 +1,156 @@
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+
+# Weight of the title and tags terms compared to the description terms
+TITLE_WEIGHT = 3
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split a text into lowercase terms without HTML tags nor accents
+
+    Args:
+        text: The text to split (e.g. "<p>Migración del módulo</p>")
+
+    Returns:
+        A list of terms (e.g. ["migracion", "del", "modulo"])
+    """
+    text = TAG_PATTERN.sub(" ", text or "")
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+
+    return TOKEN_PATTERN.findall(text)
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over the title, description and tags of workitems, ranked with BM25
+
+    The memory is bounded by the maximum number of workitems (the least recently
+    changed ones are evicted) and the maximum number of terms kept per workitem.
+    """
+
+    def __init__(self, max_documents: int, max_terms_per_document: int):
+        self.max_documents = max_documents
+        self.max_terms_per_document = max_terms_per_document
+        self.documents: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = {}
+        self.total_length = 0
+        self.last_changed_date = ""
+        # (changed date, workitem ID) of the documents, oldest first. Entries of removed
+        # or replaced documents are skipped when popped and dropped when it is rebuilt
+        self._changed_dates: list[tuple[str, str]] = []
+
+    def add_workitem(self, workitem: dict) -> None:
+        """
+        Add a workitem to the index, replacing the previous version if it was already indexed
+
+        Args:
+            workitem: A workitem with the fields System.Title, System.Description and System.Tags
+        """
+        workitem_id = str(workitem["id"])
+        fields = workitem.get("fields", {})
+        self.remove_workitem(workitem_id)
+
+        title_terms = tokenize(fields.get("System.Title", "")) + tokenize(
+            fields.get("System.Tags", "")
+        )
+        description_terms = tokenize(fields.get("System.Description", ""))
+        terms = Counter({term: 0 for term in title_terms})
+        for term in title_terms:
+            terms[term] += TITLE_WEIGHT
+        terms.update(description_terms[: self.max_terms_per_document])
+
+        length = sum(terms.values())
+        changed_date = fields.get("System.ChangedDate", "")
+        self.documents[workitem_id] = {
+            "title": fields.get("System.Title", ""),
+            "workitem_type": fields.get("System.WorkItemType", ""),
+            "state": fields.get("System.State", ""),
+            "changed_date": changed_date,
+            "terms": list(terms),
+            "length": length,
+        }
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[workitem_id] = frequency
+        self.total_length += length
+        self.last_changed_date = max(self.last_changed_date, changed_date)
+        heapq.heappush(self._changed_dates, (changed_date, workitem_id))
+
+        while len(self.documents) > self.max_documents:
+            oldest_changed_date, oldest_id = heapq.heappop(self._changed_dates)
+            document = self.documents.get(oldest_id)
+            if document is not None and document["changed_date"] == oldest_changed_date:
+                self.remove_workitem(oldest_id)
+
+        if len(self._changed_dates) > 2 * len(self.documents) + 64:
+            self._changed_dates = [
+                (document["changed_date"], document_id)
+                for document_id, document in self.documents.items()
+            ]
+            heapq.heapify(self._changed_dates)
+
+    def remove_workitem(self, workitem_id: str) -> None:
+        """
+        Remove a workitem from the index
+
+        Args:
+            workitem_id: The ID of the workitem
+        """
+        document = self.documents.pop(workitem_id, None)
+        if document is None:
+            return
+
+        for term in document["terms"]:
+            postings = self.postings[term]
+            del postings[workitem_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= document["length"]
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, float]]:
+        """
+        Search the workitems that match the query terms
+
+        Args:
+            query: The terms to search (e.g. "login error")
+            limit: The maximum number of results
+
+        Returns:
+            A list of (workitem ID, score) sorted from the best to the worst match
+        """
+        if not self.documents:
+            return []
+
+        average_length = self.total_length / len(self.documents)
+        scores: Counter[str] = Counter()
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term, {})
+            if not postings:
+                continue
+
+            idf = math.log(
+                1 + (len(self.documents) - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for workitem_id, frequency in postings.items():
+                length = self.documents[workitem_id]["length"]
+                scores[workitem_id] += (
+                    idf
+                    * frequency
+                    * (BM25_K1 + 1)
+                    / (
+                        frequency
+                        + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    )
+                )
+
+        return scores.most_common(limit)
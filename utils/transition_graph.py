@@ -0,0 +1,130 @@
+from collections import deque
+
+
+class TransitionGraph:
+    """
+    Precompiled state transition graph of a workitem type
+
+    Built once from the "states" and "transitions" of a workitem type, with
+    state names resolved case insensitively.
+    """
+
+    def __init__(self, workitem_type: dict):
+        self.workitem_type_name = workitem_type.get("name", "")
+        self.states: dict[str, str] = {}
+        self.categories: dict[str, str] = {}
+        self.adjacency: dict[str, list[str]] = {}
+        self.reverse_adjacency: dict[str, list[str]] = {}
+
+        for state in workitem_type.get("states", []):
+            self._add_state(state.get("name", ""), state.get("category", ""))
+
+        for from_state, transitions in workitem_type.get("transitions", {}).items():
+            # The "" key holds the initial states of a new workitem, not a real state
+            if not from_state:
+                continue
+
+            from_state = self._add_state(from_state)
+            for transition in transitions:
+                to_state = self._add_state(transition.get("to", ""))
+                if (
+                    to_state != from_state
+                    and to_state not in self.adjacency[from_state]
+                ):
+                    self.adjacency[from_state].append(to_state)
+                    self.reverse_adjacency[to_state].append(from_state)
+
+    def _add_state(self, name: str, category: str = "") -> str:
+        key = name.lower()
+        if key not in self.states:
+            self.states[key] = name
+            self.categories[name] = category
+            self.adjacency[name] = []
+            self.reverse_adjacency[name] = []
+        elif category:
+            self.categories[self.states[key]] = category
+
+        return self.states[key]
+
+    def resolve_state(self, name: str) -> str | None:
+        """
+        Get the canonical name of a state
+
+        Args:
+            name: The name of the state in any case (e.g. "in progress")
+
+        Returns:
+            The state name as defined in the workitem type or None if it does not exist
+        """
+        return self.states.get(name.lower())
+
+    def get_allowed_states(self, state_name: str) -> list[str]:
+        """
+        Get the states reachable in one transition from a state
+
+        Args:
+            state_name: The name of the state (e.g. "To Do")
+
+        Returns:
+            A list of state names
+        """
+        state = self.resolve_state(state_name)
+        return list(self.adjacency.get(state, [])) if state else []
+
+    def find_shortest_path(self, from_state: str, to_state: str) -> list[str] | None:
+        """
+        Find the shortest legal sequence of states between two states (breadth-first)
+
+        Args:
+            from_state: The name of the current state (e.g. "New")
+            to_state: The name of the target state (e.g. "Closed")
+
+        Returns:
+            The states from the current one to the target one (both included) or None if there is no path
+        """
+        start = self.resolve_state(from_state)
+        target = self.resolve_state(to_state)
+        if start is None or target is None:
+            return None
+
+        previous: dict[str, str | None] = {start: None}
+        pending = deque([start])
+        while pending:
+            state = pending.popleft()
+            if state == target:
+                path = []
+                while state is not None:
+                    path.append(state)
+                    state = previous[state]
+                return path[::-1]
+
+            for next_state in self.adjacency[state]:
+                if next_state not in previous:
+                    previous[next_state] = state
+                    pending.append(next_state)
+
+        return None
+
+
+_graphs: dict[str, tuple[dict, TransitionGraph]] = {}
+
+
+def get_transition_graph(workitem_type: dict) -> TransitionGraph:
+    """
+    Get the transition graph of a workitem type, building it only when the type definition changes
+
+    Args:
+        workitem_type: A workitem type with its states and transitions
+
+    Returns:
+        The transition graph of the workitem type
+    """
+    key = workitem_type.get("name", "").lower()
+    cached = _graphs.get(key)
+    if cached is not None and cached[0] is workitem_type:
+        return cached[1]
+
+    graph = TransitionGraph(workitem_type)
+    _graphs[key] = (workitem_type, graph)
+
+    return graph
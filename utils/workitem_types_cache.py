@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+
+from settings import settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+_workitem_types: list[dict] | None = None
+_workitem_types_by_name: dict[str, dict] = {}
+_loaded_from_disk = False
+_refreshed = False
+_revalidation_task: asyncio.Task | None = None
+
+
+def get_cache_key() -> str:
+    """
+    Get the key that identifies the cached workitem types
+
+    Returns:
+        The key built from the organization, project and API version
+    """
+    return f"{settings.AZURE_DEVOPS_ORGANIZATION}/{settings.AZURE_DEVOPS_PROJECT}/{settings.AZURE_DEVOPS_API_VERSION}"
+
+
+def get_cache_file_path() -> str:
+    """
+    Get the path of the on-disk workitem types cache
+
+    Returns:
+        The path of the cache file for the current organization, project and API version
+    """
+    digest = hashlib.sha1(get_cache_key().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(settings.CACHE_DIR, f"workitem_types_{digest}.json")
+
+
+def compact_workitem_type(workitem_type: dict) -> dict:
+    """
+    Keep only the workitem type metadata used by the server (fields, states and transitions)
+
+    Args:
+        workitem_type: A workitem type as returned by the API
+
+    Returns:
+        The compact workitem type
+    """
+    return {
+        "name": workitem_type.get("name", ""),
+        "referenceName": workitem_type.get("referenceName", ""),
+        "description": workitem_type.get("description", ""),
+        "isDisabled": workitem_type.get("isDisabled", False),
+        "fields": [
+            {
+                "name": field.get("name"),
+                "referenceName": field.get("referenceName"),
+                "alwaysRequired": field.get("alwaysRequired", False),
+            }
+            for field in workitem_type.get("fields", [])
+        ],
+        "states": [
+            {
+                "name": state.get("name"),
+                "category": state.get("category"),
+                "color": state.get("color"),
+            }
+            for state in workitem_type.get("states", [])
+        ],
+        "transitions": {
+            from_state: [{"to": transition.get("to")} for transition in transitions]
+            for from_state, transitions in workitem_type.get("transitions", {}).items()
+        },
+    }
+
+
+def _index_workitem_types(workitem_types: list[dict]) -> None:
+    global _workitem_types, _workitem_types_by_name
+
+    _workitem_types = workitem_types
+    _workitem_types_by_name = {
+        workitem_type["name"].lower(): workitem_type for workitem_type in workitem_types
+    }
+
+
+def load_workitem_types() -> list[dict] | None:
+    """
+    Get the cached workitem types, loading them from disk the first time
+
+    Returns:
+        The cached workitem types or None if there is no valid cache
+    """
+    global _loaded_from_disk
+
+    if _workitem_types is not None or _loaded_from_disk:
+        return _workitem_types
+
+    _loaded_from_disk = True
+    try:
+        with open(get_cache_file_path(), encoding="utf-8") as cache_file:
+            payload = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        payload.get("version") != CACHE_FORMAT_VERSION
+        or payload.get("key") != get_cache_key()
+    ):
+        return None
+
+    _index_workitem_types(payload.get("workitem_types", []))
+
+    return _workitem_types
+
+
+def get_cached_workitem_type(name: str) -> dict | None:
+    """
+    Get a cached workitem type by its name (case insensitive)
+
+    Args:
+        name: The name of the workitem type (e.g. "Task", "Bug", "Feature")
+
+    Returns:
+        The cached workitem type or None if it is not cached
+    """
+    if load_workitem_types() is None:
+        return None
+
+    return _workitem_types_by_name.get(name.lower())
+
+
+def save_workitem_types(workitem_types: list[dict]) -> list[dict]:
+    """
+    Store the workitem types in memory and on disk
+
+    Args:
+        workitem_types: A list of workitem types as returned by the API
+
+    Returns:
+        The compact workitem types that were stored
+    """
+    global _refreshed
+
+    compact_workitem_types = [
+        compact_workitem_type(workitem_type) for workitem_type in workitem_types
+    ]
+    _index_workitem_types(compact_workitem_types)
+    _refreshed = True
+
+    payload = {
+        "version": CACHE_FORMAT_VERSION,
+        "key": get_cache_key(),
+        "workitem_types": compact_workitem_types,
+    }
+
+    try:
+        os.makedirs(settings.CACHE_DIR, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=settings.CACHE_DIR)
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as temp_file:
+            json.dump(payload, temp_file, separators=(",", ":"))
+        os.replace(temp_path, get_cache_file_path())
+    except OSError as e:
+        logger.error(
+            "workitem_types_cache_save_failed", extra={"fields": {"error": str(e)}}
+        )
+
+    return compact_workitem_types
+
+
+def schedule_revalidation(fetch: Callable[[], Awaitable[list[dict]]]) -> None:
+    """
+    Refresh the workitem types loaded from disk in the background (once per process)
+
+    Args:
+        fetch: The coroutine function that downloads and saves the workitem types
+    """
+    global _revalidation_task
+
+    if _refreshed or _revalidation_task is not None:
+        return
+
+    async def revalidate() -> None:
+        try:
+            await fetch()
+        except Exception as e:
+            logger.error(
+                "workitem_types_cache_revalidation_failed",
+                extra={"fields": {"error": str(e)}},
+            )
+
+    _revalidation_task = asyncio.create_task(revalidate())